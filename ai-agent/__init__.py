@@ -2,7 +2,7 @@
 AI Code Reviewer & Mentor Package
 """
 
-from .agent import CodeReviewAgent, create_agent
+from .agent import AnalysisRequest, CodeReviewAgent, create_agent
 
 __version__ = "1.0.0"
-__all__ = ["CodeReviewAgent", "create_agent"]
+__all__ = ["AnalysisRequest", "CodeReviewAgent", "create_agent"]
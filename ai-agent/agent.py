@@ -3,22 +3,190 @@ AI Code Reviewer & Mentor Agent
 Orchestrates code analysis, scoring, and mentor feedback generation.
 """
 
+import io
+import os
 import json
+import time
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
-from groq import Groq
-from .prompts import get_system_prompt, get_analysis_prompt
-from .scoring import score_code
-from .detectors import (
-    BugDetector,
-    AntiPatternDetector,
-    SecurityDetector,
-    PerformanceDetector,
-    CleanCodeDetector
+import itertools
+import multiprocessing
+from collections import defaultdict
+from dataclasses import dataclass
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Iterator, Generator, Tuple
+import httpx
+from groq import Groq, AsyncGroq
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib parser
+    orjson = None
+
+from .prompts import (
+    get_system_prompt,
+    get_analysis_prompt,
+    estimate_tokens,
+    fit_code_to_budget,
+    MAX_CODE_TOKENS
 )
+from .scoring import score_code
+from .cache import LRUCache, SemanticCache, make_cache_key
+from .detectors import CodeContext, run_all_detectors
 
-logging.basicConfig(level=logging.INFO)
+# Library module: handlers and levels are configured by the application
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Connection pool shared by every request an agent makes to Groq
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Groq completions an agent keeps in flight at once on the async path
+_DEFAULT_LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+
+# Per-minute Groq budgets for the async path; unset means unthrottled
+_DEFAULT_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0")) or None
+_DEFAULT_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "0")) or None
+
+# Retries (exponential backoff, honouring retry-after) on 429 and transient errors
+_ASYNC_MAX_RETRIES = 4
+
+# Submissions at least this long (characters) are checked in a worker process
+# on the async path, where pure-Python detection would otherwise hold the GIL
+# against the event loop; shorter ones cost less than the round trip
+_PROCESS_DETECTION_MIN_SIZE = 20_000
+
+# Worker processes per agent for those submissions
+_DEFAULT_DETECTOR_PROCESSES = int(os.getenv("DETECTOR_PROCESSES", "2"))
+
+# Seconds the async path waits for the detectors before failing the review
+_DETECTOR_TIMEOUT = 30.0
+
+# Worker processes start from a clean interpreter: forking this process, which
+# runs detector, to_thread and logging threads, can copy a held lock and hang
+_PROCESS_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+_MENTOR_TEMPLATE = (
+    "# Code Review Summary\n"
+    "**Overall Score: {overall}/100**\n\n"
+    "{verdict}\n\n"
+    "## Score Breakdown\n\n"
+    "| Dimension | Score | Status |\n"
+    "|-----------|-------|--------|\n"
+    "{score_rows}\n"
+    "{issues_section}"
+    "## Recommendations\n\n"
+    "{recommendations}\n\n"
+    "## Next Steps\n\n"
+    "1. Review the improved code example\n"
+    "2. Address the high-priority issues\n"
+    "3. Refactor with the suggested improvements\n"
+    "4. Consider the follow-up questions below\n\n"
+)
+
+# Skill-level specific advice
+_RECOMMENDATIONS = {
+    "junior": (
+        "As you're growing as a developer, focus on:\n"
+        "- Understanding edge cases and error handling\n"
+        "- Writing self-documenting code with clear names\n"
+        "- Learning to think about performance early\n"
+        "- Studying common security patterns"
+    ),
+    "mid": (
+        "To advance to senior level:\n"
+        "- Consider scalability and maintainability\n"
+        "- Write tests for edge cases\n"
+        "- Refactor for cleaner abstractions\n"
+        "- Think about the bigger system architecture"
+    ),
+    "senior": (
+        "For production-quality code:\n"
+        "- Optimize for the 99th percentile\n"
+        "- Consider concurrency and distributed scenarios\n"
+        "- Document trade-offs and alternatives\n"
+        "- Plan for observability and debugging"
+    )
+}
+
+
+class RateLimiter:
+    """
+    Request and token budgets per minute for outgoing LLM calls.
+
+    Both budgets refill continuously up to one minute's worth, so a burst
+    can spend a full minute's capacity and later calls wait for it to
+    recover. Not thread-safe; share it only between coroutines on one
+    event loop at a time.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request budget, or None for no limit
+            tokens_per_minute: Token budget, or None for no limit
+        """
+        self.max_requests = requests_per_minute or float("inf")
+        self.max_tokens = tokens_per_minute or float("inf")
+        self._requests = self.max_requests
+        self._tokens = self.max_tokens
+        self._updated = time.monotonic()
+
+    @property
+    def needs_tokens(self) -> bool:
+        """Whether acquire() needs an accurate token count (a token budget is set)."""
+        return self.max_tokens != float("inf")
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        minutes = (now - self._updated) / 60
+        self._updated = now
+        self._requests = min(self.max_requests, self._requests + minutes * self.max_requests)
+        self._tokens = min(self.max_tokens, self._tokens + minutes * self.max_tokens)
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until one request and the given tokens fit in the budgets, then spend them.
+
+        Args:
+            tokens: Tokens the request may consume (prompt plus completion)
+        """
+        # A request larger than the whole budget would otherwise never fit
+        tokens = min(tokens, self.max_tokens)
+        while True:
+            self._refill()
+            if self._requests >= 1 and self._tokens >= tokens:
+                self._requests -= 1
+                self._tokens -= tokens
+                return
+
+            # Sleep until the scarcer budget has refilled enough
+            wait = 0.0
+            if self._requests < 1:
+                wait = (1 - self._requests) / self.max_requests
+            if self._tokens < tokens:
+                wait = max(wait, (tokens - self._tokens) / self.max_tokens)
+            await asyncio.sleep(wait * 60)
+
+
+@dataclass
+class AnalysisRequest:
+    """A single review request for CodeReviewAgent.analyze_batch."""
+
+    code: str
+    language: str
+    skill_level: str = "mid"
+    focus_areas: Optional[List[str]] = None
 
 
 class CodeReviewAgent:
@@ -27,25 +195,74 @@ class CodeReviewAgent:
     Acts as a strict senior developer mentor.
     """
 
-    def __init__(self, api_key: str, model: str = "mixtral-8x7b-32768"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "mixtral-8x7b-32768",
+        cache_size: int = 256,
+        semantic_cache: bool = True,
+        llm_concurrency: int = _DEFAULT_LLM_CONCURRENCY,
+        requests_per_minute: Optional[float] = _DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: Optional[float] = _DEFAULT_TOKENS_PER_MINUTE
+    ):
         """
         Initialize the code review agent.
 
         Args:
             api_key: Groq API key
             model: Model to use for inference
+            cache_size: Number of LLM analyses kept in the exact-match cache
+            semantic_cache: Also reuse analyses of near-identical code
+            llm_concurrency: Maximum Groq requests in flight from async calls
+            requests_per_minute: Groq request budget for async calls, None for no limit
+            tokens_per_minute: Groq token budget for async calls, None for no limit
         """
-        self.client = Groq(api_key=api_key)
+        self.api_key = api_key
+        self.client = Groq(api_key=api_key, http_client=_make_http_client())
         self.model = model
-        self.temperature = 0.3
+        # Deterministic sampling keeps cached analyses consistent with fresh ones
+        self.temperature = 0.0
+        self.seed = 42
         self.max_tokens = 2000
+        self.llm_concurrency = llm_concurrency
+        self._rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+
+        # Created on first use, bound to the event loop that created them
+        self._async_client: Optional[AsyncGroq] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._llm_slots: Optional[asyncio.Semaphore] = None
+
+        # LLM response caches
+        self._exact_cache = LRUCache(maxsize=cache_size)
+        self._semantic_cache = SemanticCache() if semantic_cache else None
+
+        # Shared pool running rule-based detection alongside the LLM call. Each
+        # request submits one detector job, and at most llm_concurrency
+        # requests have an LLM call in flight, so more threads would only
+        # run detectors for reviews that are still queued for the LLM.
+        self._detector_pool = ThreadPoolExecutor(
+            max_workers=max(1, llm_concurrency), thread_name_prefix="detector"
+        )
+        # Workers for large async submissions; processes start on first use
+        self._detector_processes = ProcessPoolExecutor(
+            max_workers=_DEFAULT_DETECTOR_PROCESSES,
+            mp_context=multiprocessing.get_context(_PROCESS_START_METHOD)
+        )
 
-        # Initialize detectors
-        self.bug_detector = BugDetector()
-        self.anti_pattern_detector = AntiPatternDetector()
-        self.security_detector = SecurityDetector()
-        self.performance_detector = PerformanceDetector()
-        self.clean_code_detector = CleanCodeDetector()
+    def close(self) -> None:
+        """Release the HTTP connection pool and detector threads."""
+        self.client.close()
+        self._detector_pool.shutdown(wait=False)
+        self._detector_processes.shutdown(wait=False)
+
+    async def aclose(self) -> None:
+        """Release the async HTTP connection pool, then everything close() does."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+            self._async_client_loop = None
+            self._llm_slots = None
+        self.close()
 
     def analyze(
         self,
@@ -66,49 +283,253 @@ class CodeReviewAgent:
         Returns:
             Structured review object with scores, issues, improvements, and mentor feedback
         """
+        result = None
+        for event in self.analyze_stream(
+            code, language, skill_level, focus_areas, stream_llm=False
+        ):
+            if event["phase"] == "done":
+                result = event["result"]
+
+        return result
+
+    def analyze_stream(
+        self,
+        code: str,
+        language: str,
+        skill_level: str = "mid",
+        focus_areas: List[str] = None,
+        stream_llm: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze code, yielding each stage of the review as soon as it is ready.
+
+        The detectors run in the background while the LLM request is in
+        flight, so their event may arrive between LLM output chunks.
+
+        Events are dicts with a "phase" key:
+            detectors: {"issues"} from the rule-based detectors
+            llm_delta: {"text"} raw LLM output chunk (only when stream_llm is set)
+            scores: {"score", "issues"} once the LLM analysis is merged
+            mentor: {"mentorExplanation"}
+            done: {"result"} the same object analyze() returns
+
+        Args:
+            code: Source code to analyze
+            language: Programming language
+            skill_level: Target skill level (junior, mid, senior)
+            focus_areas: Areas to focus on (bugs, performance, security, clean-code, all)
+            stream_llm: Stream the Groq completion instead of waiting for it
+
+        Yields:
+            Review events in the order listed above
+        """
         if focus_areas is None:
             focus_areas = ["bugs", "performance", "security", "clean-code"]
 
-        logger.info(f"Analyzing {language} code for {skill_level} level developer")
+        logger.info("Analyzing %s code for %s level developer", language, skill_level)
 
         try:
-            # Step 1: Run rule-based detectors
-            issues = self._run_detectors(code, language, focus_areas)
-
-            # Step 2: Get LLM-based analysis for deeper insights
-            llm_analysis = self._get_llm_analysis(
-                code, language, skill_level, focus_areas, issues
+            # Step 1: Start rule-based detectors in the background
+            detector_future = self._submit_detectors(code, language, focus_areas)
+            issues = None
+            prompt_code, prompt_issues = code, None
+
+            if estimate_tokens(code) > MAX_CODE_TOKENS:
+                # Large files are trimmed by issue density, which needs the detectors
+                issues = detector_future.result()
+                yield {"phase": "detectors", "issues": issues}
+                prompt_code, prompt_issues = fit_code_to_budget(code, language, issues)
+
+            # Step 2: Get LLM-based analysis while the detectors run
+            llm_events = self._stream_llm_analysis(
+                code, language, skill_level, focus_areas, prompt_issues,
+                stream=stream_llm, prompt_code=prompt_code
             )
+            try:
+                while True:
+                    try:
+                        event = next(llm_events)
+                    except StopIteration as done:
+                        llm_analysis = done.value
+                        break
+                    if issues is None and detector_future.done():
+                        issues = detector_future.result()
+                        yield {"phase": "detectors", "issues": issues}
+                    yield event
+            finally:
+                # Closing this generator early stops the Groq stream too
+                llm_events.close()
+
+            if issues is None:
+                issues = detector_future.result()
+                yield {"phase": "detectors", "issues": issues}
+
+            # Steps 3-7: Merge, score and explain
+            result = self._build_result(code, language, skill_level, issues, llm_analysis)
+            yield {"phase": "scores", "score": result["score"], "issues": result["issues"]}
+            yield {"phase": "mentor", "mentorExplanation": result["mentorExplanation"]}
+            yield {"phase": "done", "result": result}
 
-            # Step 3: Combine detector results with LLM analysis
-            all_issues = issues + llm_analysis.get("additional_issues", [])
+        except Exception as e:
+            logger.error("Error during code analysis: %s", e)
+            raise
 
-            # Step 4: Score the code
-            scores = score_code(all_issues, llm_analysis.get("code_quality", {}))
+    async def analyze_async(
+        self,
+        code: str,
+        language: str,
+        skill_level: str = "mid",
+        focus_areas: List[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Analyze code without blocking the event loop.
 
-            # Step 5: Generate improved code
-            improved_code = llm_analysis.get("improved_code", "")
+        The rule-based detectors run on the detector pool while the LLM
+        request is in flight, so total latency is roughly the slower of the
+        two. The LLM is therefore not told which issues the detectors found.
 
-            # Step 6: Generate mentor explanation
-            mentor_explanation = self._generate_mentor_explanation(
-                code, language, skill_level, all_issues, scores
-            )
+        Args:
+            code: Source code to analyze
+            language: Programming language
+            skill_level: Target skill level (junior, mid, senior)
+            focus_areas: Areas to focus on (bugs, performance, security, clean-code, all)
 
-            # Step 7: Generate follow-up questions
-            follow_up_questions = llm_analysis.get("follow_up_questions", [])
+        Returns:
+            Structured review object with scores, issues, improvements, and mentor feedback
+        """
+        return await self._analyze_async(code, language, skill_level, focus_areas)
+
+    async def _analyze_async(
+        self,
+        code: str,
+        language: str,
+        skill_level: str = "mid",
+        focus_areas: List[str] = None,
+        embedding: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """
+        analyze_async, optionally with the code's semantic-cache embedding.
 
-            return {
-                "score": scores,
-                "issues": all_issues,
-                "improvedCode": improved_code,
-                "mentorExplanation": mentor_explanation,
-                "followUpQuestions": follow_up_questions
-            }
+        Args:
+            code: Source code to analyze
+            language: Programming language
+            skill_level: Target skill level (junior, mid, senior)
+            focus_areas: Areas to focus on (bugs, performance, security, clean-code, all)
+            embedding: Precomputed embedding of code, e.g. from a batch
+
+        Returns:
+            Structured review object with scores, issues, improvements, and mentor feedback
+        """
+        if focus_areas is None:
+            focus_areas = ["bugs", "performance", "security", "clean-code"]
+
+        logger.info("Analyzing %s code for %s level developer", language, skill_level)
+
+        try:
+            detector_future = self._submit_detectors(
+                code, language, focus_areas, allow_processes=True
+            )
+            detectors_done = asyncio.wrap_future(detector_future)
+
+            if estimate_tokens(code) > MAX_CODE_TOKENS:
+                # Large files are trimmed by issue density, which needs the detectors
+                issues = await asyncio.wait_for(detectors_done, _DETECTOR_TIMEOUT)
+                prompt_code, prompt_issues = fit_code_to_budget(code, language, issues)
+                llm_analysis = await self._aget_llm_analysis(
+                    code, language, skill_level, focus_areas, prompt_issues,
+                    prompt_code=prompt_code, embedding=embedding
+                )
+            else:
+                llm_analysis = await self._aget_llm_analysis(
+                    code, language, skill_level, focus_areas, embedding=embedding
+                )
+                issues = await asyncio.wait_for(detectors_done, _DETECTOR_TIMEOUT)
+
+            return self._build_result(code, language, skill_level, issues, llm_analysis)
 
         except Exception as e:
-            logger.error(f"Error during code analysis: {str(e)}")
+            logger.error("Error during code analysis: %s", e)
             raise
 
+    async def analyze_batch(
+        self,
+        requests: List[AnalysisRequest]
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several submissions concurrently.
+
+        Semantic-cache embeddings for the whole batch are computed in one
+        batched encoder call before the individual reviews fan out.
+
+        Args:
+            requests: Review requests
+
+        Returns:
+            Review objects, in the same order as requests
+        """
+        embeddings = None
+        if self._semantic_cache is not None:
+            embeddings = await asyncio.to_thread(
+                self._semantic_cache.embed_many, [r.code for r in requests]
+            )
+        if embeddings is None:
+            embeddings = [None] * len(requests)
+
+        return await asyncio.gather(*(
+            self._analyze_async(r.code, r.language, r.skill_level, r.focus_areas, embedding)
+            for r, embedding in zip(requests, embeddings)
+        ))
+
+    def _build_result(
+        self,
+        code: str,
+        language: str,
+        skill_level: str,
+        issues: List[Dict[str, Any]],
+        llm_analysis: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Merge detector and LLM findings into the final review object.
+
+        Args:
+            code: Source code that was analyzed
+            language: Programming language
+            skill_level: Target skill level
+            issues: Issues found by rule-based detectors
+            llm_analysis: LLM analysis results
+
+        Returns:
+            Structured review object
+        """
+        # Step 3: Combine detector results with LLM analysis
+        all_issues = issues + llm_analysis.get("additional_issues", [])
+
+        # Step 4: Score the code
+        scores = score_code(all_issues, llm_analysis.get("code_quality", {}))
+
+        # Step 5: Generate improved code
+        improved_code = llm_analysis.get("improved_code", "")
+
+        # Step 6: Generate mentor explanation
+        mentor_explanation = self._generate_mentor_explanation(
+            code, language, skill_level, all_issues, scores
+        )
+
+        # Step 7: Generate follow-up questions
+        follow_up_questions = llm_analysis.get("follow_up_questions", [])
+
+        result = {
+            "score": scores,
+            "issues": all_issues,
+            "improvedCode": improved_code,
+            "mentorExplanation": mentor_explanation,
+            "followUpQuestions": follow_up_questions
+        }
+        if llm_analysis.get("failed"):
+            # Detector-only review; callers must not cache it
+            result["partial"] = True
+        return result
+
     def _run_detectors(
         self,
         code: str,
@@ -126,74 +547,292 @@ class CodeReviewAgent:
         Returns:
             List of detected issues
         """
-        issues = []
-        lines = code.split("\n")
+        return self._submit_detectors(code, language, focus_areas).result()
+
+    def _submit_detectors(
+        self,
+        code: str,
+        language: str,
+        focus_areas: List[str],
+        allow_processes: bool = False
+    ) -> Future:
+        """
+        Start the rule-based detectors on the detector pool without waiting.
+
+        Args:
+            code: Source code to analyze
+            language: Programming language
+            focus_areas: Areas to focus on
+            allow_processes: Run large submissions in a worker process
+
+        Returns:
+            Future resolving to the detected issues, in reporting order
+        """
+        run_all = "all" in focus_areas
 
-        # Run detectors based on focus areas
-        if "bugs" in focus_areas or "all" in focus_areas:
-            issues.extend(self.bug_detector.detect(code, language, lines))
+        # Select issue categories based on focus areas
+        categories = []
+        if "bugs" in focus_areas or run_all:
+            categories.append("bug")
 
-        if "security" in focus_areas or "all" in focus_areas:
-            issues.extend(self.security_detector.detect(code, language, lines))
+        if "security" in focus_areas or run_all:
+            categories.append("security")
 
-        if "performance" in focus_areas or "all" in focus_areas:
-            issues.extend(self.performance_detector.detect(code, language, lines))
+        if "performance" in focus_areas or run_all:
+            categories.append("performance")
 
-        if "clean-code" in focus_areas or "all" in focus_areas:
-            issues.extend(self.clean_code_detector.detect(code, language, lines))
-            issues.extend(self.anti_pattern_detector.detect(code, language, lines))
+        if "clean-code" in focus_areas or run_all:
+            categories.append("clean-code")
+            categories.append("anti-pattern")
+
+        if allow_processes and len(code) >= _PROCESS_DETECTION_MIN_SIZE:
+            return self._detector_processes.submit(
+                _detect_issues_in_code, code, language, categories
+            )
 
-        return issues
+        ctx = CodeContext.from_code(code, language)
+        return self._detector_pool.submit(_detect_issues, ctx, categories)
 
-    def _get_llm_analysis(
+    def _stream_llm_analysis(
         self,
         code: str,
         language: str,
         skill_level: str,
         focus_areas: List[str],
-        existing_issues: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
+        existing_issues: Optional[List[Dict[str, Any]]],
+        stream: bool = True,
+        prompt_code: Optional[str] = None
+    ) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
         """
-        Get LLM-based analysis for deeper insights and improvements.
+        Run the LLM analysis, yielding raw output chunks as they arrive.
+
+        Cache hits and non-streaming requests yield nothing. Groq's JSON mode
+        does not support streaming, so streamed responses rely on the prompt's
+        output format and are parsed leniently.
 
         Args:
             code: Source code to analyze
             language: Programming language
             skill_level: Target skill level
             focus_areas: Areas to focus on
-            existing_issues: Issues found by rule-based detectors
+            existing_issues: Issues found by rule-based detectors, if known
+            stream: Request a streamed completion
+            prompt_code: Code to send instead of code (e.g. trimmed to budget)
+
+        Yields:
+            {"phase": "llm_delta", "text": ...} events
 
         Returns:
             LLM analysis results
         """
-        system_prompt = get_system_prompt(skill_level)
-        analysis_prompt = get_analysis_prompt(
-            code, language, skill_level, focus_areas, existing_issues
+        cached, cache_entry = self._lookup_cached_analysis(
+            code, language, skill_level, focus_areas
+        )
+        if cached is not None:
+            return cached
+
+        request = self._build_llm_request(
+            prompt_code or code, language, skill_level, focus_areas, existing_issues
         )
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": analysis_prompt}
-                ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                response_format={"type": "json_object"}
+            if stream:
+                buffer = io.StringIO()
+                completion = self.client.chat.completions.create(**request, stream=True)
+                try:
+                    for chunk in completion:
+                        text = chunk.choices[0].delta.content if chunk.choices else None
+                        if text:
+                            buffer.write(text)
+                            yield {"phase": "llm_delta", "text": text}
+                finally:
+                    # Also reached when the consumer closes this generator early
+                    completion.close()
+                analysis = _parse_llm_json(buffer.getvalue())
+            else:
+                response = self.client.chat.completions.create(
+                    **request, response_format={"type": "json_object"}
+                )
+                content = response.choices[0].message.content
+                analysis = _json_loads(content)
+
+        except Exception as e:
+            logger.error("Error getting LLM analysis: %s", e)
+            return _empty_analysis()
+
+        self._store_analysis(cache_entry, analysis)
+        return analysis
+
+    async def _aget_llm_analysis(
+        self,
+        code: str,
+        language: str,
+        skill_level: str,
+        focus_areas: List[str],
+        existing_issues: Optional[List[Dict[str, Any]]] = None,
+        prompt_code: Optional[str] = None,
+        embedding: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Async counterpart of _stream_llm_analysis with stream=False.
+
+        Args:
+            code: Source code to analyze
+            language: Programming language
+            skill_level: Target skill level
+            focus_areas: Areas to focus on
+            existing_issues: Issues found by rule-based detectors, if known
+            prompt_code: Code to send instead of code (e.g. trimmed to budget)
+            embedding: Precomputed semantic-cache embedding of code, if any
+
+        Returns:
+            LLM analysis results
+        """
+        if self._semantic_cache is not None and embedding is None:
+            # Embedding the code (and loading the model on first use) is CPU-bound
+            cached, cache_entry = await asyncio.to_thread(
+                self._lookup_cached_analysis, code, language, skill_level, focus_areas
             )
+        else:
+            cached, cache_entry = self._lookup_cached_analysis(
+                code, language, skill_level, focus_areas, embedding
+            )
+        if cached is not None:
+            return cached
+
+        request = self._build_llm_request(
+            prompt_code or code, language, skill_level, focus_areas, existing_issues
+        )
 
+        client = self._get_async_client()
+        prompt_tokens = 0
+        if self._rate_limiter.needs_tokens:
+            # Tokenizing a large prompt is CPU-bound
+            prompt_tokens = await asyncio.to_thread(_count_prompt_tokens, request)
+        try:
+            # Concurrent reviews overlap their Groq round trips up to the limit
+            async with self._llm_slots:
+                await self._rate_limiter.acquire(prompt_tokens + self.max_tokens)
+                response = await client.chat.completions.create(
+                    **request, response_format={"type": "json_object"}
+                )
             content = response.choices[0].message.content
-            return json.loads(content)
+            analysis = _json_loads(content)
 
         except Exception as e:
-            logger.error(f"Error getting LLM analysis: {str(e)}")
-            return {
-                "additional_issues": [],
-                "improved_code": "",
-                "follow_up_questions": [],
-                "code_quality": {}
-            }
+            logger.error("Error getting LLM analysis: %s", e)
+            return _empty_analysis()
+
+        self._store_analysis(cache_entry, analysis)
+        return analysis
+
+    def _get_async_client(self) -> AsyncGroq:
+        """
+        Get the async Groq client for the running event loop.
+
+        httpx async connections cannot be shared between event loops, so a
+        new client (and its concurrency semaphore) is created if the loop has
+        changed since the last call. The previous client is closed on its own
+        loop, now or whenever that loop next runs; if the loop is already
+        closed its connections cannot be driven, and dropping the client
+        leaves their sockets to be collected.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            if self._async_client is not None and not self._async_client_loop.is_closed():
+                asyncio.run_coroutine_threadsafe(
+                    self._async_client.close(), self._async_client_loop
+                )
+            self._async_client = AsyncGroq(
+                api_key=self.api_key,
+                http_client=_make_async_http_client(),
+                max_retries=_ASYNC_MAX_RETRIES
+            )
+            self._async_client_loop = loop
+            self._llm_slots = asyncio.Semaphore(self.llm_concurrency)
+        return self._async_client
+
+    def _build_llm_request(
+        self,
+        code: str,
+        language: str,
+        skill_level: str,
+        focus_areas: List[str],
+        existing_issues: Optional[List[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Build the chat completion arguments shared by all request paths.
+
+        Args:
+            code: Source code to analyze
+            language: Programming language
+            skill_level: Target skill level
+            focus_areas: Areas to focus on
+            existing_issues: Issues found by rule-based detectors, if known
+
+        Returns:
+            Keyword arguments for chat.completions.create
+        """
+        system_prompt = get_system_prompt()
+        analysis_prompt = get_analysis_prompt(
+            code, language, skill_level, focus_areas, existing_issues
+        )
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": analysis_prompt}
+            ],
+            "temperature": self.temperature,
+            "seed": self.seed,
+            "max_tokens": self.max_tokens
+        }
+
+    def _lookup_cached_analysis(
+        self,
+        code: str,
+        language: str,
+        skill_level: str,
+        focus_areas: List[str],
+        embedding: Optional[Any] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Tuple]:
+        """
+        Look up a cached LLM analysis, exact match first, then semantic.
+
+        Args:
+            code: Source code to analyze
+            language: Programming language
+            skill_level: Target skill level
+            focus_areas: Areas to focus on
+            embedding: Semantic-cache embedding of code, computed here if None
+
+        Returns:
+            (cached analysis or None, cache entry to pass to _store_analysis)
+        """
+        cache_key = make_cache_key(code, language, skill_level, focus_areas)
+        cached = self._exact_cache.get(cache_key)
+        if cached is not None:
+            logger.info("LLM analysis served from exact cache")
+            return cached, ()
+
+        context = (language, skill_level, tuple(sorted(focus_areas)))
+        if embedding is None and self._semantic_cache is not None:
+            embedding = self._semantic_cache.embed(code)
+        if embedding is not None:
+            cached = self._semantic_cache.lookup(context, embedding)
+            if cached is not None:
+                logger.info("LLM analysis served from semantic cache")
+                self._exact_cache.put(cache_key, cached)
+                return cached, ()
+
+        return None, (cache_key, context, embedding)
+
+    def _store_analysis(self, cache_entry: Tuple, analysis: Dict[str, Any]) -> None:
+        """Cache a fresh LLM analysis under the entry from _lookup_cached_analysis."""
+        cache_key, context, embedding = cache_entry
+        self._exact_cache.put(cache_key, analysis)
+        if embedding is not None:
+            self._semantic_cache.add(context, embedding, analysis)
 
     def _generate_mentor_explanation(
         self,
@@ -216,90 +855,146 @@ class CodeReviewAgent:
         Returns:
             Markdown-formatted explanation
         """
-        explanation_parts = []
+        issues_key = tuple(
+            (
+                issue.get("category", "other"),
+                issue.get("line", "?"),
+                issue.get("severity", "info"),
+                issue.get("message", "")
+            )
+            for issue in issues
+        )
+        # Row order follows the scores dict, so the key keeps insertion order
+        scores_key = tuple(scores.items())
 
-        # Overall assessment
-        explanation_parts.append(f"# Code Review Summary\n")
-        overall_score = scores.get("overall", 0)
-        explanation_parts.append(f"**Overall Score: {overall_score}/100**\n\n")
+        try:
+            return _render_mentor_explanation(issues_key, scores_key, skill_level)
+        except TypeError:
+            # Unhashable values from the LLM (e.g. a list as "line"); render uncached
+            return _render_mentor_explanation.__wrapped__(issues_key, scores_key, skill_level)
+
+
+@lru_cache(maxsize=256)
+def _render_mentor_explanation(
+    issues_key: Tuple[Tuple[Any, Any, Any, Any], ...],
+    scores_key: Tuple[Tuple[str, int], ...],
+    skill_level: str
+) -> str:
+    """
+    Render the mentor explanation markdown.
 
-        if overall_score >= 80:
-            explanation_parts.append("This is solid work! Here are some suggestions to take it from good to great.\n\n")
-        elif overall_score >= 60:
-            explanation_parts.append("The code works but needs attention in several areas. Let's improve it together.\n\n")
-        else:
-            explanation_parts.append("This code needs significant improvements. Here's what we need to address.\n\n")
-
-        # Score breakdown
-        explanation_parts.append("## Score Breakdown\n\n")
-        explanation_parts.append("| Dimension | Score | Status |\n")
-        explanation_parts.append("|-----------|-------|--------|\n")
-
-        for dimension, score in scores.items():
-            if dimension == "overall":
-                continue
-            status = "✅ Good" if score >= 80 else "⚠️ Needs Work" if score >= 60 else "❌ Poor"
-            explanation_parts.append(f"| {dimension.capitalize()} | {score}/100 | {status} |\n")
-
-        explanation_parts.append("\n")
-
-        # Key issues summary
-        if issues:
-            explanation_parts.append("## Key Issues Found\n\n")
-
-            # Group by category
-            categories = {}
-            for issue in issues:
-                category = issue.get("category", "other")
-                if category not in categories:
-                    categories[category] = []
-                categories[category].append(issue)
-
-            for category, category_issues in categories.items():
-                explanation_parts.append(f"### {category.capitalize()}\n\n")
-                for issue in category_issues[:5]:  # Limit to top 5 per category
-                    line = issue.get("line", "?")
-                    severity = issue.get("severity", "info")
-                    message = issue.get("message", "")
-                    explanation_parts.append(f"**Line {line} ({severity})**: {message}\n\n")
-
-        # Skill-level specific advice
-        explanation_parts.append("## Recommendations\n\n")
-        if skill_level == "junior":
-            explanation_parts.append(
-                "As you're growing as a developer, focus on:\n"
-                "- Understanding edge cases and error handling\n"
-                "- Writing self-documenting code with clear names\n"
-                "- Learning to think about performance early\n"
-                "- Studying common security patterns\n\n"
-            )
-        elif skill_level == "mid":
-            explanation_parts.append(
-                "To advance to senior level:\n"
-                "- Consider scalability and maintainability\n"
-                "- Write tests for edge cases\n"
-                "- Refactor for cleaner abstractions\n"
-                "- Think about the bigger system architecture\n\n"
-            )
-        else:  # senior
-            explanation_parts.append(
-                "For production-quality code:\n"
-                "- Optimize for the 99th percentile\n"
-                "- Consider concurrency and distributed scenarios\n"
-                "- Document trade-offs and alternatives\n"
-                "- Plan for observability and debugging\n\n"
-            )
+    Args:
+        issues_key: (category, line, severity, message) for each issue
+        scores_key: (dimension, score) pairs in display order
+        skill_level: Target skill level
 
-        # Next steps
-        explanation_parts.append("## Next Steps\n\n")
-        explanation_parts.append(
-            "1. Review the improved code example\n"
-            "2. Address the high-priority issues\n"
-            "3. Refactor with the suggested improvements\n"
-            "4. Consider the follow-up questions below\n\n"
-        )
+    Returns:
+        Markdown-formatted explanation
+    """
+    scores = dict(scores_key)
+    overall_score = scores.get("overall", 0)
+
+    if overall_score >= 80:
+        verdict = "This is solid work! Here are some suggestions to take it from good to great."
+    elif overall_score >= 60:
+        verdict = "The code works but needs attention in several areas. Let's improve it together."
+    else:
+        verdict = "This code needs significant improvements. Here's what we need to address."
+
+    score_rows = "".join(
+        f"| {dimension.capitalize()} | {score}/100 | {_score_status(score)} |\n"
+        for dimension, score in scores_key
+        if dimension != "overall"
+    )
+
+    # Key issues summary
+    issues_section = ""
+    if issues_key:
+        # Group by category
+        categories = defaultdict(list)
+        for issue in issues_key:
+            categories[issue[0]].append(issue)
+
+        sections = ["## Key Issues Found\n\n"]
+        for category, category_issues in categories.items():
+            sections.append(f"### {category.capitalize()}\n\n")
+            for _, line, severity, message in category_issues[:5]:  # Limit to top 5 per category
+                sections.append(f"**Line {line} ({severity})**: {message}\n\n")
+        issues_section = "".join(sections)
+
+    return _MENTOR_TEMPLATE.format(
+        overall=overall_score,
+        verdict=verdict,
+        score_rows=score_rows,
+        issues_section=issues_section,
+        recommendations=_RECOMMENDATIONS.get(skill_level, _RECOMMENDATIONS["senior"])
+    )
+
+
+def _detect_issues(ctx: CodeContext, categories: List[str]) -> List[Dict[str, Any]]:
+    """Run the detectors in one pass and flatten issues in category order."""
+    found = run_all_detectors(ctx, categories)
+    return list(itertools.chain.from_iterable(found[c] for c in categories))
+
+
+def _detect_issues_in_code(code: str, language: str, categories: List[str]) -> List[Dict[str, Any]]:
+    """_detect_issues for a worker process, which receives the source rather than a context."""
+    return _detect_issues(CodeContext.from_code(code, language), categories)
+
+
+def _count_prompt_tokens(request: Dict[str, Any]) -> int:
+    """Estimated prompt tokens of a request from _build_llm_request."""
+    return sum(estimate_tokens(message["content"]) for message in request["messages"])
+
+
+def _make_http_client() -> httpx.Client:
+    """Pooled HTTP/2 client so Groq calls reuse TLS connections."""
+    return httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
 
-        return "".join(explanation_parts)
+
+def _make_async_http_client() -> httpx.AsyncClient:
+    """Async counterpart of _make_http_client."""
+    return httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+
+
+def _empty_analysis() -> Dict[str, Any]:
+    """LLM analysis used when the Groq request fails. It is never cached."""
+    return {
+        "additional_issues": [],
+        "improved_code": "",
+        "follow_up_questions": [],
+        "code_quality": {},
+        "failed": True
+    }
+
+
+def _score_status(score: int) -> str:
+    """Status label shown next to a dimension score."""
+    return "✅ Good" if score >= 80 else "⚠️ Needs Work" if score >= 60 else "❌ Poor"
+
+
+def _json_loads(content: str) -> Any:
+    """Parse JSON with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _parse_llm_json(content: str) -> Dict[str, Any]:
+    """
+    Parse a JSON object from LLM output that may be wrapped in prose or fences.
+
+    Args:
+        content: Raw completion text
+
+    Returns:
+        Parsed JSON object
+    """
+    start = content.find("{")
+    end = content.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("LLM response contains no JSON object")
+    return _json_loads(content[start:end + 1])
 
 
 def create_agent(api_key: str) -> CodeReviewAgent:
@@ -0,0 +1,280 @@
+"""
+Response caching for the AI Code Reviewer & Mentor.
+Short-circuits Groq calls for repeated or near-identical submissions.
+"""
+
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy ships with sentence-transformers; optional otherwise
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(
+    code: str,
+    language: str,
+    skill_level: str,
+    focus_areas: List[str]
+) -> str:
+    """
+    Build the exact-match cache key for a review request.
+
+    Args:
+        code: Source code to analyze
+        language: Programming language
+        skill_level: Target skill level
+        focus_areas: Areas to focus on
+
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = "\0".join([language, skill_level, ",".join(sorted(focus_areas)), code])
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _quantize(embedding: Any) -> Tuple[Any, float]:
+    """
+    Quantize an embedding to int8 with a symmetric scale.
+
+    Args:
+        embedding: float32 vector
+
+    Returns:
+        (int8 vector, scale) such that vector * scale approximates embedding
+    """
+    scale = float(np.abs(embedding).max()) / 127 or 1.0
+    return np.round(embedding / scale).astype(np.int8), scale
+
+
+def normalize_code(code: str) -> str:
+    """
+    Collapse whitespace so formatting-only edits embed identically.
+
+    Args:
+        code: Source code
+
+    Returns:
+        Normalized code
+    """
+    return " ".join(code.split())
+
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry.
+
+    Safe to share between threads (detector pool, to_thread workers).
+    """
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+        """
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store value under key, evicting the oldest entry when full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TTLCache(LRUCache):
+    """LRU cache whose entries also expire a fixed time after being stored."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 3600):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Seconds an entry stays valid
+        """
+        super().__init__(maxsize)
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or expiry."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store value under key until the TTL elapses."""
+        super().put(key, (time.monotonic() + self.ttl, value))
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache over sentence-transformer embeddings of code.
+
+    Entries are partitioned by request context (language, skill level, focus
+    areas) so a hit never crosses those boundaries. Stored embeddings are
+    quantized to int8 with a per-row scale, a quarter of the float32 size.
+    The encoder is loaded on first use; if sentence-transformers is not
+    installed the cache disables itself and every lookup misses.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        threshold: float = 0.95,
+        max_entries: int = 1024
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            model_name: Sentence-transformer model used for embeddings
+            threshold: Minimum cosine similarity that counts as a hit
+            max_entries: Maximum entries kept per request context
+        """
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._encoder = None
+        self._available = np is not None
+        # context -> (int8 embedding matrix [N, dim], row scales [N], responses).
+        # Entries are replaced, never mutated, so lookup() sees a consistent
+        # snapshot without the lock; add() holds it to not lose updates.
+        self._entries: Dict[Tuple, Tuple[Any, Any, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def _get_encoder(self):
+        if self._encoder is None and self._available:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                logger.info("sentence-transformers not installed, semantic cache disabled")
+                self._available = False
+                return None
+            self._encoder = SentenceTransformer(self.model_name)
+        return self._encoder
+
+    def embed(self, code: str) -> Optional[Any]:
+        """
+        Embed normalized code.
+
+        Args:
+            code: Source code
+
+        Returns:
+            L2-normalized float32 vector, or None when the cache is disabled
+        """
+        encoder = self._get_encoder()
+        if encoder is None:
+            return None
+        return encoder.encode(
+            normalize_code(code),
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        ).astype(np.float32)
+
+    def embed_many(self, codes: List[str]) -> Optional[List[Any]]:
+        """
+        Embed many snippets in one batched encoder call.
+
+        Args:
+            codes: Source code snippets
+
+        Returns:
+            One embedding per snippet, in order, or None when the cache is disabled
+        """
+        encoder = self._get_encoder()
+        if encoder is None:
+            return None
+
+        normalized = [normalize_code(code) for code in codes]
+        unique = list(dict.fromkeys(normalized))
+        embeddings = encoder.encode(
+            unique,
+            batch_size=32,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        ).astype(np.float32)
+        by_code = dict(zip(unique, embeddings))
+        return [by_code[n] for n in normalized]
+
+    def lookup(self, context: Tuple, embedding: Any) -> Optional[Dict[str, Any]]:
+        """
+        Find a cached response whose code is close enough to the query.
+
+        Args:
+            context: Request context tuple
+            embedding: Query embedding from embed()
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        entry = self._entries.get(context)
+        if entry is None:
+            return None
+
+        matrix, scales, responses = entry
+        query, query_scale = _quantize(embedding)
+        scores = (matrix @ query.astype(np.int32)) * (scales * query_scale)
+        best = int(scores.argmax())
+        if scores[best] > self.threshold:
+            return responses[best]
+        return None
+
+    def add(self, context: Tuple, embedding: Any, response: Dict[str, Any]) -> None:
+        """
+        Store a response under its embedding.
+
+        Args:
+            context: Request context tuple
+            embedding: Embedding from embed()
+            response: LLM analysis to cache
+        """
+        row, scale = _quantize(embedding)
+        with self._lock:
+            entry = self._entries.get(context)
+            if entry is None:
+                self._entries[context] = (
+                    row[np.newaxis, :], np.array([scale], dtype=np.float32), [response]
+                )
+                return
+
+            matrix, scales, responses = entry
+            matrix = np.vstack([matrix, row])
+            scales = np.append(scales, np.float32(scale))
+            responses = responses + [response]
+            if len(responses) > self.max_entries:
+                matrix = matrix[1:]
+                scales = scales[1:]
+                responses = responses[1:]
+            self._entries[context] = (matrix, scales, responses)
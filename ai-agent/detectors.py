@@ -4,266 +4,554 @@ Detects bugs, anti-patterns, security issues, performance problems, and clean co
 """
 
 import re
-from typing import List, Dict, Any
+import bisect
+import hashlib
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+from typing import List, Dict, Any, FrozenSet, Iterable, Mapping, Set, Tuple
 from abc import ABC, abstractmethod
 
-
-class BaseDetector(ABC):
-    """Base class for all code detectors."""
-
-    @abstractmethod
-    def detect(
-        self,
-        code: str,
-        language: str,
-        lines: List[str]
-    ) -> List[Dict[str, Any]]:
+from .cache import LRUCache
+
+
+# Precompiled patterns, shared by every detector instance.
+# Bugs
+_NESTED_ACCESS_RE = re.compile(r'\w+\.\w+\.\w+')  # Nested property access
+_METHOD_CALL_RE = re.compile(r'\w+\.\w+\(')
+_KEY_ACCESS_RE = re.compile(r'\[\w+\]|\["\w+"\]')  # Dict access without .get()
+_LOOP_BOUND_RE = re.compile(r'for.*i\s*<\s*\w+\.length')  # for (...; i < xs.length; ...)
+
+# Anti-patterns
+_FUNCTION_START_RE = re.compile(r'def |function |=> ')
+_MAGIC_NUMBER_RE = re.compile(r'\b(?!0|1\b)\d{2,}\b')
+_POOR_NAMES = ('temp', 'tmp', 'data', 'info', 'var1', 'var2', 'x', 'y')
+_POOR_NAMES_RE = re.compile(r'\b(' + '|'.join(_POOR_NAMES) + r')\b')
+
+# Security: each category is one alternation so a line is scanned once.
+# Patterns matched against the whole file use [^\S\n] so they stay on one line.
+_SQL_INJECTION_RE = re.compile(
+    '|'.join([
+        r'execute\([^\S\n]*["\'].*\+.*["\']',
+        r'query\([^\S\n]*["\'].*\+.*["\']',
+        r'"SELECT.*" \+ ',
+        r'"INSERT.*" \+ ',
+        r'"UPDATE.*" \+ ',
+        r'"DELETE.*" \+ '
+    ]),
+    re.IGNORECASE
+)
+# Secret patterns, in reporting order, with the kind of secret each finds
+_SECRET_PATTERNS = tuple(
+    (re.compile(pattern, re.IGNORECASE), secret_type)
+    for pattern, secret_type in [
+        (r'api[_-]?key\s*=\s*["\'][\w-]{20,}["\']', "API key"),
+        (r'password\s*=\s*["\'][^"\']{4,}["\']', "password"),
+        (r'secret\s*=\s*["\'][\w-]{10,}["\']', "secret"),
+        (r'token\s*=\s*["\'][\w-]{20,}["\']', "token"),
+        (r'private[_-]?key\s*=\s*["\'][\w-]{20,}["\']', "private key")
+    ]
+)
+# Every secret pattern contains one of these (case-insensitive)
+_SECRET_KEYWORDS = ('key', 'password', 'secret', 'token')
+# Literal signatures (XSS sinks, weak crypto), matched across the whole file
+# in a single scan. The XSS lookahead reports every occurrence, including
+# overlapping ones; crypto names are case-insensitive whole words.
+_WEAK_CRYPTO = ('md5', 'sha1', 'rc4', 'des', 'ecb')
+_SIGNATURE_RE = re.compile(
+    r'(?=(innerHTML|outerHTML|eval\())'
+    r'|\b((?i:' + '|'.join(_WEAK_CRYPTO) + r'))\b',
+    re.ASCII
+)
+_COMMENT_AUTH_RE = re.compile(r'(?://|#)[^\S\n]*(?:if|require|auth)')
+
+# Performance
+_LOOP_BRACE_RE = re.compile(r'for.*\{')
+_QUERY_CALL_RE = re.compile(r'query|find|select|execute', re.IGNORECASE)
+_SIZE_CALL_RE = re.compile(r'\.(?:length|size|count)\(\)')
+_NOOP_ARITHMETIC_RE = re.compile(r'\+[^\S\n]*0|-[^\S\n]*0|\*[^\S\n]*1|/[^\S\n]*1')
+
+# Clean code
+_CLASS_RE = re.compile(r'class \w+')
+_METHOD_DEF_RE = re.compile(r'(?:def |function )\w+\(')
+
+
+# Issue templates: the fixed fields of each kind of finding, shared by every
+# match. Messages and explanations may contain {placeholders} filled per match.
+_TEMPLATE_FIELDS = {
+    "null_access": {
+        "severity": "warning",
+        "category": "bug",
+        "message": "Potential null/undefined access on nested properties",
+        "explanation": "Accessing nested properties without null checks can throw runtime errors if intermediate values are null or undefined.",
+        "suggestion": "Use optional chaining (?.) or explicit null checks before accessing nested properties."
+    },
+    "async_error": {
+        "severity": "warning",
+        "category": "bug",
+        "message": "Async operation without error handling",
+        "explanation": "Unhandled promise rejections can crash your application or lead to silent failures.",
+        "suggestion": "Wrap await in try/catch or use .catch() to handle errors gracefully."
+    },
+    "type_coercion": {
+        "severity": "warning",
+        "category": "bug",
+        "message": "Using loose equality (==) instead of strict equality (===)",
+        "explanation": "Loose equality can lead to unexpected type coercion bugs (e.g., '' == 0 is true).",
+        "suggestion": "Always use strict equality (===) and (!==) to avoid type coercion surprises."
+    },
+    "none_error": {
+        "severity": "warning",
+        "category": "bug",
+        "message": "Method call without None check",
+        "explanation": "Calling methods on potentially None objects will raise AttributeError.",
+        "suggestion": "Add explicit None check or use optional chaining (python 3.10+)."
+    },
+    "key_error": {
+        "severity": "warning",
+        "category": "bug",
+        "message": "Dictionary access without key check",
+        "explanation": "Direct dictionary access will raise KeyError if key doesn't exist.",
+        "suggestion": "Use .get() method with default value or check key existence first."
+    },
+    "off_by_one": {
+        "severity": "info",
+        "category": "bug",
+        "message": "Verify loop boundary for off-by-one error",
+        "explanation": "Common source of bugs - ensure you're accessing the correct indices.",
+        "suggestion": "Double-check your loop conditions and array access patterns."
+    },
+    "infinite_loop": {
+        "severity": "error",
+        "category": "bug",
+        "message": "Potential infinite loop",
+        "explanation": "While loop with condition that never becomes false will run forever.",
+        "suggestion": "Ensure loop condition changes within the loop body or add explicit break condition."
+    },
+    "deep_nesting": {
+        "severity": "warning",
+        "category": "anti-pattern",
+        "message": "Deep nesting ({levels} levels) detected",
+        "explanation": "Deep nesting makes code hard to read and understand. It often indicates complex logic that could be simplified.",
+        "suggestion": "Extract nested blocks into separate functions, use early returns, or apply guard clauses."
+    },
+    "duplication": {
+        "severity": "info",
+        "category": "anti-pattern",
+        "message": "Potential code duplication",
+        "explanation": "Duplicate code violates DRY principle and makes maintenance harder.",
+        "suggestion": "Extract common logic into a function or constant."
+    },
+    "long_function": {
+        "severity": "warning",
+        "category": "anti-pattern",
+        "message": "Long function ({lines} lines)",
+        "explanation": "Long functions are hard to understand, test, and maintain.",
+        "suggestion": "Break down into smaller, single-responsibility functions."
+    },
+    "magic_number": {
+        "severity": "info",
+        "category": "anti-pattern",
+        "message": "Magic number detected",
+        "explanation": "Hard-coded numbers without explanation make code harder to maintain.",
+        "suggestion": "Replace with named constants that explain the value's purpose."
+    },
+    "poor_name": {
+        "severity": "info",
+        "category": "anti-pattern",
+        "message": "Poor variable name: '{name}'",
+        "explanation": "Generic names don't convey intent and make code harder to understand.",
+        "suggestion": "Use descriptive names that explain the variable's purpose."
+    },
+    "secret": {
+        "severity": "error",
+        "category": "security",
+        "message": "Hardcoded {secret_type} detected",
+        "explanation": "Hardcoded secrets in code are a security risk and will be exposed in version control.",
+        "suggestion": "Use environment variables or a secret management system."
+    },
+    "n_plus_one": {
+        "severity": "warning",
+        "category": "performance",
+        "message": "Potential N+1 query problem",
+        "explanation": "Executing database queries inside loops causes severe performance issues.",
+        "suggestion": "Use eager loading, batch queries, or joins to fetch data in a single query."
+    },
+    "loop_invariant": {
+        "severity": "warning",
+        "category": "performance",
+        "message": "Repeated calculation inside loop",
+        "explanation": "Calculating array length/count inside loops is inefficient.",
+        "suggestion": "Move the calculation outside the loop or cache the value."
+    },
+    "listener_leak": {
+        "severity": "warning",
+        "category": "performance",
+        "message": "Event listener without cleanup",
+        "explanation": "Event listeners that are never removed can cause memory leaks.",
+        "suggestion": "Store references to listeners and remove them when no longer needed."
+    },
+    "long_line": {
+        "severity": "info",
+        "category": "clean-code",
+        "message": "Line too long ({length} characters)",
+        "explanation": "Long lines are hard to read and don't fit well on screens or in diffs.",
+        "suggestion": "Break long lines into multiple lines or extract logic to variables."
+    },
+    "commented_code": {
+        "severity": "info",
+        "category": "clean-code",
+        "message": "Multiple consecutive commented lines",
+        "explanation": "Commented code clutters the codebase and should be removed.",
+        "suggestion": "Delete commented code or use version control to recover it if needed."
+    },
+    "dead_code": {
+        "severity": "warning",
+        "category": "clean-code",
+        "message": "Unreachable code after return",
+        "explanation": "Code after a return statement will never execute.",
+        "suggestion": "Remove the unreachable code or restructure the logic."
+    },
+    "god_class": {
+        "severity": "warning",
+        "category": "clean-code",
+        "message": "Class may be doing too much (Single Responsibility Principle)",
+        "explanation": "Large classes with many methods violate SRP and are hard to maintain.",
+        "suggestion": "Split the class into smaller, focused classes with single responsibilities."
+    },
+    "sql_injection": {
+        "severity": "error",
+        "category": "security",
+        "message": "Potential SQL injection vulnerability",
+        "explanation": "Concatenating user input into SQL queries allows attackers to execute arbitrary SQL.",
+        "suggestion": "Use parameterized queries or prepared statements instead."
+    },
+    "xss": {
+        "severity": "error",
+        "category": "security",
+        "message": "Potential XSS vulnerability via innerHTML",
+        "explanation": "Setting innerHTML with untrusted data can lead to cross-site scripting attacks.",
+        "suggestion": "Use textContent or sanitize HTML with a library like DOMPurify."
+    },
+    "eval": {
+        "severity": "error",
+        "category": "security",
+        "message": "Use of eval() is dangerous",
+        "explanation": "eval() executes arbitrary code and is a major security risk.",
+        "suggestion": "Never use eval(). Find alternative approaches to achieve your goal."
+    },
+    "weak_crypto": {
+        "severity": "error",
+        "category": "security",
+        "message": "Weak cryptographic algorithm: {algo}",
+        "explanation": "{algo} is cryptographically broken and should not be used.",
+        "suggestion": "Use stronger alternatives like SHA-256, SHA-3, or AES-GCM."
+    },
+    "auth_bypass": {
+        "severity": "warning",
+        "category": "security",
+        "message": "Commented out authorization check",
+        "explanation": "Commented auth checks may be accidentally left that way in production.",
+        "suggestion": "Remove commented code or ensure proper authorization is in place."
+    },
+    "unnecessary_operation": {
+        "severity": "info",
+        "category": "performance",
+        "message": "Unnecessary arithmetic operation",
+        "explanation": "These operations don't change the value and waste CPU cycles.",
+        "suggestion": "Remove the unnecessary operation."
+    }
+}
+# Frozen, with a leading line slot so a copy keeps the issue's key order
+_TEMPLATES: Dict[str, Mapping[str, Any]] = {
+    name: MappingProxyType({"line": 0, **fields})
+    for name, fields in _TEMPLATE_FIELDS.items()
+}
+# Fields of each template that contain {placeholders}
+_TEMPLATE_PLACEHOLDERS: Dict[str, Tuple[str, ...]] = {
+    name: tuple(key for key, text in fields.items() if '{' in text)
+    for name, fields in _TEMPLATE_FIELDS.items()
+}
+
+
+def _issue(template: str, line: int, **values: Any) -> Dict[str, Any]:
+    """
+    Build an issue from a registered template.
+
+    Args:
+        template: Key into _TEMPLATES
+        line: 1-based line number
+        values: Values for the template's {placeholders}
+
+    Returns:
+        Issue dict
+    """
+    issue = _TEMPLATES[template].copy()
+    issue["line"] = line
+    if values:
+        for key in _TEMPLATE_PLACEHOLDERS[template]:
+            issue[key] = issue[key].format_map(values)
+    return issue
+
+
+@dataclass
+class CodeContext:
+    """
+    Source code prepared once and shared by every detector.
+
+    Views only some detectors need (line offsets, indentation unit) are
+    built the first time one asks for them.
+    """
+
+    code: str
+    language: str
+    lines: Tuple[str, ...]
+    stripped: Tuple[str, ...]
+
+    @classmethod
+    def from_code(cls, code: str, language: str) -> "CodeContext":
         """
-        Detect issues in code.
+        Split code into the per-line views used by detectors.
 
         Args:
             code: Full source code
             language: Programming language
-            lines: List of code lines
 
         Returns:
-            List of detected issues
+            CodeContext instance
         """
-        pass
-
-
-class BugDetector(BaseDetector):
-    """Detects logic errors, null pointer risks, and edge case misses."""
-
-    def detect(
-        self,
-        code: str,
-        language: str,
-        lines: List[str]
-    ) -> List[Dict[str, Any]]:
-        issues = []
+        lines = tuple(code.split("\n"))
+        return cls(
+            code=code,
+            language=language,
+            lines=lines,
+            stripped=tuple(line.lstrip() for line in lines)
+        )
+
+    @cached_property
+    def line_starts(self) -> List[int]:
+        """Offset of the first character of each line."""
+        return [0] + [match.end() for match in re.finditer('\n', self.code)]
+
+    def line_of(self, offset: int) -> int:
+        """
+        Get the line containing a character offset.
 
-        # Detect potential null/undefined access
-        if language in ["javascript", "typescript"]:
-            issues.extend(self._detect_null_access(lines))
-            issues.extend(self._detect_async_errors(lines))
-            issues.extend(self._detect_type_coercion(lines))
+        Args:
+            offset: Offset into code
 
-        elif language == "python":
-            issues.extend(self._detect_none_errors(lines))
-            issues.extend(self._detect_key_errors(lines))
+        Returns:
+            1-based line number
+        """
+        return bisect.bisect_right(self.line_starts, offset)
 
-        # Common bugs across languages
-        issues.extend(self._detect_off_by_one(lines))
-        issues.extend(self._detect_infinite_loops(lines))
+    def find_literals(self, pattern: re.Pattern) -> Dict[int, Set[str]]:
+        """
+        Scan the whole file once for a literal alternation.
 
-        return issues
+        Args:
+            pattern: Compiled pattern with one group per literal alternative
 
-    def _detect_null_access(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-        pattern = r'\w+\.\w+\.\w+'  # Nested property access without null check
-
-        for i, line in enumerate(lines, 1):
-            if re.search(pattern, line) and '?.?' not in line and '?.(' not in line:
-                if 'if' not in line and 'try' not in line:
-                    issues.append({
-                        "line": i,
-                        "severity": "warning",
-                        "category": "bug",
-                        "message": "Potential null/undefined access on nested properties",
-                        "explanation": "Accessing nested properties without null checks can throw runtime errors if intermediate values are null or undefined.",
-                        "suggestion": "Use optional chaining (?.) or explicit null checks before accessing nested properties."
-                    })
-
-        return issues
-
-    def _detect_async_errors(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
+        Returns:
+            Matched literals per 1-based line number, in line order
+        """
+        hits: Dict[int, Set[str]] = {}
+        for match in pattern.finditer(self.code):
+            hits.setdefault(self.line_of(match.start()), set()).add(match.group(match.lastindex))
+        return hits
 
-        for i, line in enumerate(lines, 1):
-            # Detect async/await without error handling
-            if 'await ' in line and 'try' not in ''.join(lines[max(0, i-5):i]):
-                if '.catch(' not in line:
-                    issues.append({
-                        "line": i,
-                        "severity": "warning",
-                        "category": "bug",
-                        "message": "Async operation without error handling",
-                        "explanation": "Unhandled promise rejections can crash your application or lead to silent failures.",
-                        "suggestion": "Wrap await in try/catch or use .catch() to handle errors gracefully."
-                    })
-
-        return issues
-
-    def _detect_type_coercion(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-        pattern = r'==\s*\w+|\w+\s*=='
-
-        for i, line in enumerate(lines, 1):
-            if '==' in line and '===' not in line and '!==' not in line:
-                issues.append({
-                    "line": i,
-                    "severity": "warning",
-                    "category": "bug",
-                    "message": "Using loose equality (==) instead of strict equality (===)",
-                    "explanation": "Loose equality can lead to unexpected type coercion bugs (e.g., '' == 0 is true).",
-                    "suggestion": "Always use strict equality (===) and (!==) to avoid type coercion surprises."
-                })
-
-        return issues
-
-    def _detect_none_errors(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
+    def match_lines(self, *patterns: re.Pattern) -> List[int]:
+        """
+        Scan the whole file for single-line patterns.
 
-        for i, line in enumerate(lines, 1):
-            # Detect method calls without None check
-            if '.' in line and 'if' not in ''.join(lines[max(0, i-3):i]):
-                if re.search(r'\w+\.\w+\(', line) and 'try' not in line:
-                    issues.append({
-                        "line": i,
-                        "severity": "warning",
-                        "category": "bug",
-                        "message": "Method call without None check",
-                        "explanation": "Calling methods on potentially None objects will raise AttributeError.",
-                        "suggestion": "Add explicit None check or use optional chaining (python 3.10+)."
-                    })
-
-        return issues
-
-    def _detect_key_errors(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-        pattern = r'\[\w+\]|\["\w+"\]'  # Dict access without .get()
-
-        for i, line in enumerate(lines, 1):
-            if re.search(pattern, line) and '.get(' not in line:
-                if 'if' not in line and 'try' not in line:
-                    issues.append({
-                        "line": i,
-                        "severity": "warning",
-                        "category": "bug",
-                        "message": "Dictionary access without key check",
-                        "explanation": "Direct dictionary access will raise KeyError if key doesn't exist.",
-                        "suggestion": "Use .get() method with default value or check key existence first."
-                    })
-
-        return issues
-
-    def _detect_off_by_one(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
+        Args:
+            patterns: Compiled patterns that never match across a newline
 
-        for i, line in enumerate(lines, 1):
-            # Check for loop conditions that might have off-by-one errors
-            if re.search(r'for.*<.*\.length', line) and '+ 1' not in line:
-                if re.search(r'i\s*<\s*\w+\.length', line):
-                    issues.append({
-                        "line": i,
-                        "severity": "info",
-                        "category": "bug",
-                        "message": "Verify loop boundary for off-by-one error",
-                        "explanation": "Common source of bugs - ensure you're accessing the correct indices.",
-                        "suggestion": "Double-check your loop conditions and array access patterns."
-                    })
-
-        return issues
-
-    def _detect_infinite_loops(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-        open_braces = 0
+        Returns:
+            Sorted 1-based numbers of lines containing at least one match
+        """
+        found = set()
+        for pattern in patterns:
+            for match in pattern.finditer(self.code):
+                found.add(self.line_of(match.start()))
+        return sorted(found)
+
+    @cached_property
+    def indent_unit(self) -> int:
+        """Indentation width of the file: 2 or 4, judged from the first space-indented line."""
+        for line in self.lines:
+            indent = len(line) - len(line.lstrip(' '))
+            if indent:
+                return 4 if indent % 4 == 0 else 2
+        return 4
+
+
+# Issue categories produced by the built-in detectors, in reporting order
+DETECTOR_CATEGORIES = ("bug", "anti-pattern", "security", "performance", "clean-code")
+
+# Recent run_all_detectors results, keyed by (language, categories, code digest)
+_RESULT_CACHE = LRUCache(maxsize=256)
+
+# Distinct lines remembered by the duplication check before it starts over
+_MAX_SEEN_LINES = 100_000
+
+# Language-independent checks that cannot fire in a given language's syntax
+_SKIPPED_CHECKS = {
+    "python": frozenset({"off_by_one"}),  # C-style `i < xs.length` loop bounds
+}
+
+
+def run_all_detectors(
+    ctx: CodeContext,
+    categories: Iterable[str] = DETECTOR_CATEGORIES
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run the built-in checks for several categories in one pass over the lines.
+
+    Every line-based check shares a single loop, so the line tuple is walked
+    once however many categories are requested. Checks that match literals
+    across the whole file scan the source text directly. Each check keeps its
+    own bucket, so issues come out in the same order as running the
+    detectors one after another.
+
+    Results are memoized by content hash, so re-checking an unchanged file
+    skips the scan. Callers always receive fresh issue dicts.
+
+    Args:
+        ctx: Prepared source code
+        categories: Categories to check, any of DETECTOR_CATEGORIES
+
+    Returns:
+        Issues per requested category
+    """
+    categories = frozenset(categories)
+    key = (
+        ctx.language,
+        categories,
+        hashlib.blake2b(ctx.code.encode(), digest_size=16).digest()
+    )
+    results = _RESULT_CACHE.get(key)
+    if results is None:
+        results = _run_checks(ctx, categories)
+        _RESULT_CACHE.put(key, results)
+
+    return {
+        category: [dict(issue) for issue in issues]
+        for category, issues in results.items()
+    }
+
+
+def _run_checks(
+    ctx: CodeContext,
+    categories: FrozenSet[str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Uncached body of run_all_detectors."""
+    bugs = "bug" in categories
+    anti_patterns = "anti-pattern" in categories
+    security = "security" in categories
+    performance = "performance" in categories
+    clean_code = "clean-code" in categories
+
+    is_js = ctx.language in ["javascript", "typescript"]
+    is_python = ctx.language == "python"
+    skipped = _SKIPPED_CHECKS.get(ctx.language, frozenset())
+    check_off_by_one = "off_by_one" not in skipped
+    lines = ctx.lines
+    stripped_lines = ctx.stripped
+    line_count = len(lines)
+
+    # Bugs
+    null_access, async_errors, type_coercion = [], [], []
+    none_errors, key_errors, off_by_one, infinite_loops = [], [], [], []
+    last_try_line = -5
+    last_if_line = -3
+    # Anti-patterns
+    deep_nesting, duplication, long_functions, magic_numbers, poor_naming = [], [], [], [], []
+    indent_unit = ctx.indent_unit if anti_patterns else 4
+    seen_hashes: Set[int] = set()
+    in_function = False
+    function_start = 0
+    function_lines = 0
+    brace_count = 0
+    # Security
+    secrets = []
+    # Performance
+    n_plus_one, inefficient_loops, memory_leaks = [], [], []
+    # Loop header lines still waiting for a match in their lookahead window
+    query_loops: List[int] = []
+    size_loops: List[int] = []
+    # Clean code
+    long_lines, commented_code, dead_code, solid_violations = [], [], [], []
+    consecutive_comments = 0
+    in_class = False
+    class_lines = 0
+    class_methods = 0
+
+    for i, (line, stripped) in enumerate(zip(lines, stripped_lines), 1):
+        line_length = len(line)
+
+        if bugs:
+            if is_js:
+                # Nested property access without null check
+                if line.count('.') >= 2 and '?.?' not in line and '?.(' not in line:
+                    if 'if' not in line and 'try' not in line and _NESTED_ACCESS_RE.search(line):
+                        null_access.append(_issue("null_access", i))
+
+                if 'try' in line:
+                    last_try_line = i
+
+                # Async/await without error handling (no try in this or the previous 4 lines)
+                if 'await ' in line and i - last_try_line >= 5:
+                    if '.catch(' not in line:
+                        async_errors.append(_issue("async_error", i))
+
+                if '==' in line and '===' not in line and '!==' not in line:
+                    type_coercion.append(_issue("type_coercion", i))
+
+            elif is_python:
+                if 'if' in line:
+                    last_if_line = i
+
+                # Method calls without None check (no if in this or the previous 2 lines)
+                if '.' in line and i - last_if_line >= 3:
+                    if '(' in line and 'try' not in line and _METHOD_CALL_RE.search(line):
+                        none_errors.append(_issue("none_error", i))
+
+                if '[' in line and '.get(' not in line and _KEY_ACCESS_RE.search(line):
+                    if 'if' not in line and 'try' not in line:
+                        key_errors.append(_issue("key_error", i))
+
+            # Loop conditions that might have off-by-one errors
+            if check_off_by_one and '.length' in line and '<' in line and '+ 1' not in line:
+                if _LOOP_BOUND_RE.search(line):
+                    off_by_one.append(_issue("off_by_one", i))
 
-        for i, line in enumerate(lines, 1):
             if 'while(' in line or 'while (' in line:
                 # Check if loop condition never changes
-                if 'true' in line.lower() or 'true' in line.lower():
-                    if 'break' not in ''.join(lines[i:i+10]):
-                        issues.append({
-                            "line": i,
-                            "severity": "error",
-                            "category": "bug",
-                            "message": "Potential infinite loop",
-                            "explanation": "While loop with condition that never becomes false will run forever.",
-                            "suggestion": "Ensure loop condition changes within the loop body or add explicit break condition."
-                        })
-
-        return issues
-
-
-class AntiPatternDetector(BaseDetector):
-    """Identifies code smells and anti-patterns."""
-
-    def detect(
-        self,
-        code: str,
-        language: str,
-        lines: List[str]
-    ) -> List[Dict[str, Any]]:
-        issues = []
-
-        issues.extend(self._detect_deep_nesting(lines))
-        issues.extend(self._detect_code_duplication(code, lines))
-        issues.extend(self._detect_long_functions(code, lines))
-        issues.extend(self._detect_magic_numbers(lines))
-        issues.extend(self._detect_poor_naming(lines))
-
-        return issues
-
-    def _detect_deep_nesting(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-
-        for i, line in enumerate(lines, 1):
-            # Count indentation level
-            stripped = line.lstrip()
-            indent = len(line) - len(stripped)
+                if 'true' in line.lower():
+                    if not any('break' in lines[k] for k in range(i, min(i + 10, line_count))):
+                        infinite_loops.append(_issue("infinite_loop", i))
 
-            # Estimate nesting level (assuming 2 or 4 space indentation)
-            indent_size = 2 if '  ' in line[:10] else 4
-            nesting_level = indent // indent_size
+        if anti_patterns:
+            nesting_level = (line_length - len(stripped)) // indent_unit
 
             if nesting_level > 4:
-                issues.append({
-                    "line": i,
-                    "severity": "warning",
-                    "category": "anti-pattern",
-                    "message": f"Deep nesting ({nesting_level} levels) detected",
-                    "explanation": "Deep nesting makes code hard to read and understand. It often indicates complex logic that could be simplified.",
-                    "suggestion": "Extract nested blocks into separate functions, use early returns, or apply guard clauses."
-                })
-
-        return issues
-
-    def _detect_code_duplication(self, code: str, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-
-        # Simple duplication detection - look for repeated patterns
-        # In production, use more sophisticated algorithms
-        seen_lines = {}
-        for i, line in enumerate(lines, 1):
-            normalized = re.sub(r'\s+', ' ', line.strip())
-            if len(normalized) > 20:  # Ignore short lines
-                if normalized in seen_lines:
-                    issues.append({
-                        "line": i,
-                        "severity": "info",
-                        "category": "anti-pattern",
-                        "message": "Potential code duplication",
-                        "explanation": "Duplicate code violates DRY principle and makes maintenance harder.",
-                        "suggestion": "Extract common logic into a function or constant."
-                    })
-                else:
-                    seen_lines[normalized] = i
-
-        return issues[:5]  # Limit to avoid too many warnings
-
-    def _detect_long_functions(self, code: str, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-
-        # Simple function length detection
-        in_function = False
-        function_start = 0
-        function_lines = 0
-        brace_count = 0
-
-        for i, line in enumerate(lines, 1):
-            if re.search(r'(def |function |=> )', line):
+                deep_nesting.append(_issue("deep_nesting", i, levels=nesting_level))
+
+            # Simple duplication detection - look for repeated lines
+            if len(duplication) < 5:  # Limit to avoid too many warnings
+                normalized = ' '.join(line.split())
+                if len(normalized) > 20:  # Ignore short lines
+                    line_hash = hash(normalized)
+                    if line_hash in seen_hashes:
+                        duplication.append(_issue("duplication", i))
+                    else:
+                        if len(seen_hashes) >= _MAX_SEEN_LINES:
+                            seen_hashes.clear()
+                        seen_hashes.add(line_hash)
+
+            # Simple function length detection
+            if _FUNCTION_START_RE.search(line):
                 in_function = True
                 function_start = i
                 function_lines = 0
@@ -274,396 +562,221 @@ class AntiPatternDetector(BaseDetector):
                 brace_count += line.count('{') - line.count('}')
 
                 if brace_count == 0 and function_lines > 50:
-                    issues.append({
-                        "line": function_start,
-                        "severity": "warning",
-                        "category": "anti-pattern",
-                        "message": f"Long function ({function_lines} lines)",
-                        "explanation": "Long functions are hard to understand, test, and maintain.",
-                        "suggestion": "Break down into smaller, single-responsibility functions."
-                    })
+                    long_functions.append(_issue("long_function", function_start, lines=function_lines))
                     in_function = False
 
-        return issues
-
-    def _detect_magic_numbers(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-
-        for i, line in enumerate(lines, 1):
-            # Detect standalone numbers (not 0, 1, or in comments)
-            if re.search(r'\b(?!0|1\b)\d{2,}\b', line) and '#' not in line and '//' not in line:
+            # Standalone numbers (not 0, 1, or in comments)
+            if len(magic_numbers) < 5 and '#' not in line and '//' not in line:
                 if '=' in line or 'return' in line or 'if' in line or '<' in line or '>' in line:
-                    issues.append({
-                        "line": i,
-                        "severity": "info",
-                        "category": "anti-pattern",
-                        "message": "Magic number detected",
-                        "explanation": "Hard-coded numbers without explanation make code harder to maintain.",
-                        "suggestion": "Replace with named constants that explain the value's purpose."
-                    })
-
-        return issues[:5]
-
-    def _detect_poor_naming(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-        poor_names = ['temp', 'tmp', 'data', 'info', 'var1', 'var2', 'x', 'y']
-
-        for i, line in enumerate(lines, 1):
-            for name in poor_names:
-                pattern = rf'\b{name}\b'
-                if re.search(pattern, line):
-                    # Skip if it's in a comment
-                    if '#' not in line and '//' not in line:
-                        issues.append({
-                            "line": i,
-                            "severity": "info",
-                            "category": "anti-pattern",
-                            "message": f"Poor variable name: '{name}'",
-                            "explanation": "Generic names don't convey intent and make code harder to understand.",
-                            "suggestion": "Use descriptive names that explain the variable's purpose."
-                        })
-
-        return issues[:3]
-
+                    if _MAGIC_NUMBER_RE.search(line):
+                        magic_numbers.append(_issue("magic_number", i))
+
+            # Generic names, skipping comments
+            if len(poor_naming) < 3 and '#' not in line and '//' not in line:
+                found = {match.group(1) for match in _POOR_NAMES_RE.finditer(line)}
+                for name in _POOR_NAMES:
+                    if name in found and len(poor_naming) < 3:
+                        poor_naming.append(_issue("poor_name", i, name=name))
+
+        # Hardcoded secrets, skipping comments and placeholders
+        # (every secret pattern is an assignment to a known keyword)
+        if security and '=' in line and '#' not in line and '//' not in line and 'TODO' not in line:
+            line_lower = line.lower()
+            if any(keyword in line_lower for keyword in _SECRET_KEYWORDS):
+                for pattern, secret_type in _SECRET_PATTERNS:
+                    if pattern.search(line):
+                        secrets.append(_issue("secret", i, secret_type=secret_type))
+
+        if performance:
+            # Database queries within 5 lines after a loop header
+            if query_loops:
+                query_loops = [start for start in query_loops if i - start <= 5]
+                if query_loops and _QUERY_CALL_RE.search(line):
+                    for start in query_loops:
+                        n_plus_one.append(_issue("n_plus_one", start))
+                    query_loops = []
+
+            if '{' in line and _LOOP_BRACE_RE.search(line):
+                query_loops.append(i)
+
+            # Size calculations within 10 lines after a loop header
+            if size_loops:
+                size_loops = [start for start in size_loops if i - start <= 10]
+                if size_loops and '()' in line and _SIZE_CALL_RE.search(line):
+                    for _ in size_loops:
+                        inefficient_loops.append(_issue("loop_invariant", i - 1))
+                    size_loops = []
 
-class SecurityDetector(BaseDetector):
-    """Detects security vulnerabilities."""
+            if 'for' in line or 'while' in line:
+                size_loops.append(i)
 
-    def detect(
-        self,
-        code: str,
-        language: str,
-        lines: List[str]
-    ) -> List[Dict[str, Any]]:
-        issues = []
+            # Event listeners without cleanup nearby
+            if 'addEventListener' in line or 'on(' in line:
+                context = '\n'.join(lines[max(0, i-5):min(i+20, line_count)])
+                if 'removeEventListener' not in context and 'off(' not in context:
+                    memory_leaks.append(_issue("listener_leak", i))
 
-        issues.extend(self._detect_sql_injection(lines))
-        issues.extend(self._detect_xss(lines))
-        issues.extend(self._detect_hardcoded_secrets(lines))
-        issues.extend(self._detect_insecure_crypto(lines))
-        issues.extend(self._detect_auth_bypass(lines))
+        if clean_code:
+            if line_length > 120 and len(long_lines) < 5:
+                long_lines.append(_issue("long_line", i, length=line_length))
 
-        return issues
+            if stripped.startswith(('//', '#')):
+                consecutive_comments += 1
+                # Report each run of comments once, when it reaches four lines
+                if consecutive_comments == 4:
+                    commented_code.append(_issue("commented_code", i - 2))
+            else:
+                consecutive_comments = 0
 
-    def _detect_sql_injection(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-        dangerous_patterns = [
-            r'execute\(\s*["\'].*\+.*["\']',
-            r'query\(\s*["\'].*\+.*["\']',
-            r'"SELECT.*" \+ ',
-            r'"INSERT.*" \+ ',
-            r'"UPDATE.*" \+ ',
-            r'"DELETE.*" \+ '
+            # Code after a return statement
+            if 'return' in line and 'else:' not in line and 'else ' not in line:
+                if any(
+                    stripped_lines[k] and not stripped_lines[k].startswith(('#', '//', '}'))
+                    for k in range(i, min(i + 3, line_count))
+                ):
+                    dead_code.append(_issue("dead_code", i + 1))
+
+            # God classes (too many methods/lines)
+            if len(solid_violations) < 2:
+                if 'class ' in line and _CLASS_RE.search(line):
+                    in_class = True
+                    class_lines = 0
+                    class_methods = 0
+                elif in_class:
+                    class_lines += 1
+                    if '(' in line and _METHOD_DEF_RE.search(line):
+                        class_methods += 1
+
+                    # End of class
+                    if class_lines > 500 or class_methods > 20:
+                        solid_violations.append(_issue("god_class", i - class_lines))
+                        in_class = False
+
+    # Merge buckets into one list per category; whole-file checks append to it
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    if bugs:
+        results["bug"] = [
+            *null_access, *async_errors, *type_coercion,
+            *none_errors, *key_errors, *off_by_one, *infinite_loops
         ]
-
-        for i, line in enumerate(lines, 1):
-            for pattern in dangerous_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    issues.append({
-                        "line": i,
-                        "severity": "error",
-                        "category": "security",
-                        "message": "Potential SQL injection vulnerability",
-                        "explanation": "Concatenating user input into SQL queries allows attackers to execute arbitrary SQL.",
-                        "suggestion": "Use parameterized queries or prepared statements instead."
-                    })
-
-        return issues
-
-    def _detect_xss(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-
-        for i, line in enumerate(lines, 1):
-            if 'innerHTML' in line or 'outerHTML' in line:
-                if 'sanitize' not in line and 'DOMPurify' not in line:
-                    issues.append({
-                        "line": i,
-                        "severity": "error",
-                        "category": "security",
-                        "message": "Potential XSS vulnerability via innerHTML",
-                        "explanation": "Setting innerHTML with untrusted data can lead to cross-site scripting attacks.",
-                        "suggestion": "Use textContent or sanitize HTML with a library like DOMPurify."
-                    })
-
-            if 'eval(' in line:
-                issues.append({
-                    "line": i,
-                    "severity": "error",
-                    "category": "security",
-                    "message": "Use of eval() is dangerous",
-                    "explanation": "eval() executes arbitrary code and is a major security risk.",
-                    "suggestion": "Never use eval(). Find alternative approaches to achieve your goal."
-                })
-
-        return issues
-
-    def _detect_hardcoded_secrets(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-        secret_patterns = [
-            (r'api[_-]?key\s*=\s*["\'][\w-]{20,}["\']', "API key"),
-            (r'password\s*=\s*["\'][^"\']{4,}["\']', "password"),
-            (r'secret\s*=\s*["\'][\w-]{10,}["\']', "secret"),
-            (r'token\s*=\s*["\'][\w-]{20,}["\']', "token"),
-            (r'private[_-]?key\s*=\s*["\'][\w-]{20,}["\']', "private key")
+    if anti_patterns:
+        results["anti-pattern"] = [
+            *deep_nesting, *duplication, *long_functions, *magic_numbers, *poor_naming
         ]
-
-        for i, line in enumerate(lines, 1):
-            for pattern, secret_type in secret_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    # Skip if it's a comment or placeholder
-                    if '#' not in line and '//' not in line and 'TODO' not in line:
-                        issues.append({
-                            "line": i,
-                            "severity": "error",
-                            "category": "security",
-                            "message": f"Hardcoded {secret_type} detected",
-                            "explanation": "Hardcoded secrets in code are a security risk and will be exposed in version control.",
-                            "suggestion": "Use environment variables or a secret management system."
-                        })
-
-        return issues
-
-    def _detect_insecure_crypto(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-        weak_crypto = ['md5', 'sha1', 'rc4', 'des', 'ecb']
-
-        for i, line in enumerate(lines, 1):
-            for algo in weak_crypto:
-                if algo in line.lower():
-                    issues.append({
-                        "line": i,
-                        "severity": "error",
-                        "category": "security",
-                        "message": f"Weak cryptographic algorithm: {algo.upper()}",
-                        "explanation": f"{algo.upper()} is cryptographically broken and should not be used.",
-                        "suggestion": f"Use stronger alternatives like SHA-256, SHA-3, or AES-GCM."
-                    })
-
-        return issues
-
-    def _detect_auth_bypass(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-
-        for i, line in enumerate(lines, 1):
-            # Check for commented out auth checks
-            if re.search(r'//\s*(if|require|auth)', line) or re.search(r'#\s*(if|require|auth)', line):
-                issues.append({
-                    "line": i,
-                    "severity": "warning",
-                    "category": "security",
-                    "message": "Commented out authorization check",
-                    "explanation": "Commented auth checks may be accidentally left that way in production.",
-                    "suggestion": "Remove commented code or ensure proper authorization is in place."
-                })
-
-        return issues
-
-
-class PerformanceDetector(BaseDetector):
-    """Detects performance issues and bottlenecks."""
-
-    def detect(
-        self,
-        code: str,
-        language: str,
-        lines: List[str]
-    ) -> List[Dict[str, Any]]:
+    if security:
         issues = []
+        signatures = ctx.find_literals(_SIGNATURE_RE)
+        _detect_sql_injection(ctx, issues)
+        _detect_xss(ctx, signatures, issues)
+        issues.extend(secrets)
+        _detect_insecure_crypto(signatures, issues)
+        _detect_auth_bypass(ctx, issues)
+        results["security"] = issues
+    if performance:
+        issues = [*n_plus_one, *inefficient_loops, *memory_leaks]
+        _detect_unnecessary_operations(ctx, issues)
+        results["performance"] = issues
+    if clean_code:
+        results["clean-code"] = [*long_lines, *commented_code, *dead_code, *solid_violations]
+    return results
+
+
+# Whole-file checks: these scan the source text instead of the line loop and
+# append to the category's issue list
+
+def _detect_sql_injection(ctx: CodeContext, issues: List[Dict[str, Any]]) -> None:
+    for i in ctx.match_lines(_SQL_INJECTION_RE):
+        issues.append(_issue("sql_injection", i))
+
+
+def _detect_xss(
+    ctx: CodeContext,
+    signatures: Dict[int, Set[str]],
+    issues: List[Dict[str, Any]]
+) -> None:
+    for i, sinks in signatures.items():
+        line = ctx.lines[i - 1]
+        if 'innerHTML' in sinks or 'outerHTML' in sinks:
+            if 'sanitize' not in line and 'DOMPurify' not in line:
+                issues.append(_issue("xss", i))
+
+        if 'eval(' in sinks:
+            issues.append(_issue("eval", i))
+
+
+def _detect_insecure_crypto(
+    signatures: Dict[int, Set[str]],
+    issues: List[Dict[str, Any]]
+) -> None:
+    for i, found in signatures.items():
+        found = {algo.lower() for algo in found}
+        for algo in _WEAK_CRYPTO:
+            if algo in found:
+                issues.append(_issue("weak_crypto", i, algo=algo.upper()))
+
+
+def _detect_auth_bypass(ctx: CodeContext, issues: List[Dict[str, Any]]) -> None:
+    # Check for commented out auth checks
+    for i in ctx.match_lines(_COMMENT_AUTH_RE):
+        issues.append(_issue("auth_bypass", i))
+
+
+def _detect_unnecessary_operations(
+    ctx: CodeContext,
+    issues: List[Dict[str, Any]]
+) -> None:
+    # Check for redundant operations
+    for i in ctx.match_lines(_NOOP_ARITHMETIC_RE):
+        issues.append(_issue("unnecessary_operation", i))
 
-        issues.extend(self._detect_n_plus_one(lines))
-        issues.extend(self._detect_inefficient_loops(lines))
-        issues.extend(self._detect_memory_leaks(lines))
-        issues.extend(self._detect_unnecessary_operations(lines))
-
-        return issues
-
-    def _detect_n_plus_one(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
 
-        for i, line in enumerate(lines, 1):
-            # Look for database queries inside loops
-            if re.search(r'for.*\{', line):
-                # Check next few lines for query patterns
-                for j in range(i, min(i + 5, len(lines))):
-                    next_line = lines[j]
-                    if re.search(r'(query|find|select|execute)', next_line, re.IGNORECASE):
-                        issues.append({
-                            "line": i,
-                            "severity": "warning",
-                            "category": "performance",
-                            "message": "Potential N+1 query problem",
-                            "explanation": "Executing database queries inside loops causes severe performance issues.",
-                            "suggestion": "Use eager loading, batch queries, or joins to fetch data in a single query."
-                        })
-                        break
-
-        return issues
-
-    def _detect_inefficient_loops(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
+class BaseDetector(ABC):
+    """Base class for all code detectors."""
 
-        for i, line in enumerate(lines, 1):
-            # Check for operations inside loops that could be outside
-            if 'for' in line or 'while' in line:
-                # Look for expensive operations in the next few lines
-                for j in range(i, min(i + 10, len(lines))):
-                    next_line = lines[j]
-                    if re.search(r'\.(length|size|count)\(\)', next_line):
-                        issues.append({
-                            "line": j,
-                            "severity": "warning",
-                            "category": "performance",
-                            "message": "Repeated calculation inside loop",
-                            "explanation": "Calculating array length/count inside loops is inefficient.",
-                            "suggestion": "Move the calculation outside the loop or cache the value."
-                        })
-                        break
-
-        return issues
-
-    def _detect_memory_leaks(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
+    @abstractmethod
+    def detect(self, ctx: CodeContext) -> List[Dict[str, Any]]:
+        """
+        Detect issues in code.
 
-        for i, line in enumerate(lines, 1):
-            # Check for event listeners without cleanup
-            if 'addEventListener' in line or 'on(' in line:
-                # Look for removeEventListener nearby
-                context = '\n'.join(lines[max(0, i-5):min(i+20, len(lines))])
-                if 'removeEventListener' not in context and 'off(' not in context:
-                    issues.append({
-                        "line": i,
-                        "severity": "warning",
-                        "category": "performance",
-                        "message": "Event listener without cleanup",
-                        "explanation": "Event listeners that are never removed can cause memory leaks.",
-                        "suggestion": "Store references to listeners and remove them when no longer needed."
-                    })
-
-        return issues
-
-    def _detect_unnecessary_operations(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
+        Args:
+            ctx: Prepared source code
 
-        for i, line in enumerate(lines, 1):
-            # Check for redundant operations
-            if re.search(r'\+\s*0|-\s*0|\*\s*1|/\s*1', line):
-                issues.append({
-                    "line": i,
-                    "severity": "info",
-                    "category": "performance",
-                    "message": "Unnecessary arithmetic operation",
-                    "explanation": "These operations don't change the value and waste CPU cycles.",
-                    "suggestion": "Remove the unnecessary operation."
-                })
+        Returns:
+            List of detected issues
+        """
+        pass
 
-        return issues
 
+class BugDetector(BaseDetector):
+    """Detects logic errors, null pointer risks, and edge case misses."""
 
-class CleanCodeDetector(BaseDetector):
-    """Detects violations of clean code principles."""
+    def detect(self, ctx: CodeContext) -> List[Dict[str, Any]]:
+        return run_all_detectors(ctx, ("bug",))["bug"]
 
-    def detect(
-        self,
-        code: str,
-        language: str,
-        lines: List[str]
-    ) -> List[Dict[str, Any]]:
-        issues = []
 
-        issues.extend(self._detect_long_lines(lines))
-        issues.extend(self._detect_commented_code(lines))
-        issues.extend(self._detect_dead_code(lines))
-        issues.extend(self._detect_solid_violations(code, lines))
+class AntiPatternDetector(BaseDetector):
+    """Identifies code smells and anti-patterns."""
 
-        return issues
+    def detect(self, ctx: CodeContext) -> List[Dict[str, Any]]:
+        return run_all_detectors(ctx, ("anti-pattern",))["anti-pattern"]
 
-    def _detect_long_lines(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
 
-        for i, line in enumerate(lines, 1):
-            if len(line) > 120:
-                issues.append({
-                    "line": i,
-                    "severity": "info",
-                    "category": "clean-code",
-                    "message": f"Line too long ({len(line)} characters)",
-                    "explanation": "Long lines are hard to read and don't fit well on screens or in diffs.",
-                    "suggestion": "Break long lines into multiple lines or extract logic to variables."
-                })
+class SecurityDetector(BaseDetector):
+    """Detects security vulnerabilities."""
 
-        return issues[:5]
+    def detect(self, ctx: CodeContext) -> List[Dict[str, Any]]:
+        return run_all_detectors(ctx, ("security",))["security"]
 
-    def _detect_commented_code(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
-        consecutive_comments = 0
 
-        for i, line in enumerate(lines, 1):
-            if line.strip().startswith('//') or line.strip().startswith('#'):
-                consecutive_comments += 1
-                if consecutive_comments > 3:
-                    issues.append({
-                        "line": i - 2,
-                        "severity": "info",
-                        "category": "clean-code",
-                        "message": "Multiple consecutive commented lines",
-                        "explanation": "Commented code clutters the codebase and should be removed.",
-                        "suggestion": "Delete commented code or use version control to recover it if needed."
-                    })
-                    consecutive_comments = 0
-            else:
-                consecutive_comments = 0
+class PerformanceDetector(BaseDetector):
+    """Detects performance issues and bottlenecks."""
 
-        return issues
+    def detect(self, ctx: CodeContext) -> List[Dict[str, Any]]:
+        return run_all_detectors(ctx, ("performance",))["performance"]
 
-    def _detect_dead_code(self, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
 
-        for i, line in enumerate(lines, 1):
-            # Check for unreachable code patterns
-            if 'return' in line and 'else:' not in line and 'else ' not in line:
-                # Check if there's code after return
-                context = lines[i:i+3]
-                if any(code.strip() and not code.strip().startswith(('#', '//', '}')) for code in context):
-                    issues.append({
-                        "line": i + 1,
-                        "severity": "warning",
-                        "category": "clean-code",
-                        "message": "Unreachable code after return",
-                        "explanation": "Code after a return statement will never execute.",
-                        "suggestion": "Remove the unreachable code or restructure the logic."
-                    })
-
-        return issues
-
-    def _detect_solid_violations(self, code: str, lines: List[str]) -> List[Dict[str, Any]]:
-        issues = []
+class CleanCodeDetector(BaseDetector):
+    """Detects violations of clean code principles."""
 
-        # Check for God class (too many methods/lines)
-        class_pattern = re.compile(r'class \w+')
-        in_class = False
-        class_lines = 0
-        class_methods = 0
-
-        for i, line in enumerate(lines, 1):
-            if class_pattern.search(line):
-                in_class = True
-                class_lines = 0
-                class_methods = 0
-            elif in_class:
-                class_lines += 1
-                if re.search(r'(def |function )\w+\(', line):
-                    class_methods += 1
-
-                # End of class
-                if class_lines > 500 or class_methods > 20:
-                    issues.append({
-                        "line": i - class_lines,
-                        "severity": "warning",
-                        "category": "clean-code",
-                        "message": "Class may be doing too much (Single Responsibility Principle)",
-                        "explanation": "Large classes with many methods violate SRP and are hard to maintain.",
-                        "suggestion": "Split the class into smaller, focused classes with single responsibilities."
-                    })
-                    in_class = False
-
-        return issues[:2]
+    def detect(self, ctx: CodeContext) -> List[Dict[str, Any]]:
+        return run_all_detectors(ctx, ("clean-code",))["clean-code"]
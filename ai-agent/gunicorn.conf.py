@@ -0,0 +1,21 @@
+"""
+Gunicorn configuration for running the AI agent server in production.
+
+Run from the repository root:
+    gunicorn -c ai-agent/gunicorn.conf.py
+"""
+
+import os
+
+wsgi_app = "ai-agent.server:app"
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# ASGI workers, each with its own event loop (uvloop when installed) and agent
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+
+# Seconds a worker may go without notifying the arbiter before it is killed
+# and restarted. With async workers this is a heartbeat, not a per-request
+# limit; the margin covers event-loop stalls such as a first model load.
+timeout = 120
+graceful_timeout = 30
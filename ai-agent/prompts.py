@@ -3,18 +3,23 @@ Prompt templates for the AI Code Reviewer & Mentor.
 Enforces a strict senior developer mentorship persona.
 """
 
+import ast
+import bisect
+import logging
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
-def get_system_prompt(skill_level: str = "mid") -> str:
-    """
-    Get the system prompt that establishes the mentor persona.
+try:
+    import tiktoken
+except ImportError:  # fall back to the 4-characters-per-token estimate
+    tiktoken = None
 
-    Args:
-        skill_level: Target skill level of the developer
+logger = logging.getLogger(__name__)
 
-    Returns:
-        System prompt string
-    """
-    base_prompt = """You are an expert code reviewer and senior engineering mentor with 15+ years of experience. Your role is to provide honest, actionable feedback that helps developers grow.
+
+# Static prompt content. Kept byte-for-byte stable across requests and placed
+# ahead of any per-request content so provider-side prefix caching can reuse it.
+SYSTEM_PROMPT = """You are an expert code reviewer and senior engineering mentor with 15+ years of experience. Your role is to provide honest, actionable feedback that helps developers grow.
 
 Your approach:
 - Be direct and honest - sugarcoating doesn't help anyone improve
@@ -32,11 +37,56 @@ Your feedback should:
 5. Suggest architectural improvements
 6. Provide concrete, implementable solutions
 
-Always provide specific line references and code examples. Don't just say "fix this" - show how."""
+Always provide specific line references and code examples. Don't just say "fix this" - show how.
+
+Each review request states the developer's skill level and includes guidance for that level. Adapt the depth and tone of your feedback accordingly."""
+
+ANALYSIS_INSTRUCTIONS = """Analyze the code provided at the end of this message thoroughly.
+
+Your task:
+1. Identify additional issues not caught by rule-based detectors
+2. Provide deep analysis of the code's quality and architecture
+3. Generate an improved version of the code addressing all issues
+4. Create 3 diverse follow-up questions to challenge the developer's thinking - one on design choices, one on edge cases, one on trade-offs
+
+Respond in this exact JSON format:
+{
+  "additional_issues": [
+    {
+      "line": <line_number>,
+      "severity": "error|warning|info",
+      "category": "bug|performance|security|clean-code|anti-pattern",
+      "message": "Brief description of the issue",
+      "explanation": "Detailed explanation of why this is a problem",
+      "suggestion": "How a senior engineer would fix this"
+    }
+  ],
+  "improved_code": "Complete refactored code with all improvements applied",
+  "follow_up_questions": [
+    "Question 1 that challenges thinking",
+    "Question 2 about edge cases",
+    "Question 3 about trade-offs"
+  ],
+  "code_quality": {
+    "architecture": "Assessment of overall architecture",
+    "readability": "Assessment of code readability",
+    "maintainability": "Assessment of maintainability",
+    "performance": "Assessment of performance characteristics",
+    "security": "Assessment of security posture"
+  }
+}
 
-    skill_level_guidance = {
-        "junior": """
-When reviewing for junior developers:
+Focus on producing actionable, senior-level feedback that helps the developer improve."""
+
+# Rough token budget for the code section of the analysis prompt, including
+# the detector issues listed alongside trimmed code
+MAX_CODE_TOKENS = 8000
+
+# Detector issues listed alongside code trimmed by fit_code_to_budget
+MAX_PROMPT_ISSUES = 50
+
+SKILL_LEVEL_GUIDANCE = {
+    "junior": """When reviewing for junior developers:
 - Explain fundamental concepts thoroughly
 - Provide detailed step-by-step solutions
 - Include educational context about why something matters
@@ -44,8 +94,7 @@ When reviewing for junior developers:
 - Be encouraging but firm about quality standards
 - Focus on preventing common beginner mistakes""",
 
-        "mid": """
-When reviewing for mid-level developers:
+    "mid": """When reviewing for mid-level developers:
 - Assume understanding of fundamentals
 - Focus on architectural decisions and patterns
 - Push for better abstractions and separation of concerns
@@ -53,8 +102,7 @@ When reviewing for mid-level developers:
 - Encourage thinking about scalability and maintainability
 - Challenge them to consider edge cases and failure modes""",
 
-        "senior": """
-When reviewing for senior developers:
+    "senior": """When reviewing for senior developers:
 - Assume deep technical knowledge
 - Critique architectural decisions rigorously
 - Question assumptions and design choices
@@ -62,9 +110,30 @@ When reviewing for senior developers:
 - Consider operational concerns (monitoring, debugging, deployment)
 - Push for production-ready, battle-tested code
 - Ask critical questions about edge cases and failure scenarios"""
-    }
+}
+
+
+def get_system_prompt() -> str:
+    """
+    Get the system prompt that establishes the mentor persona.
+
+    Returns:
+        System prompt string
+    """
+    return SYSTEM_PROMPT
+
+
+def get_skill_level_guidance(skill_level: str) -> str:
+    """
+    Get review guidance for a skill level.
+
+    Args:
+        skill_level: Target skill level of the developer
 
-    return base_prompt + "\n\n" + skill_level_guidance.get(skill_level, skill_level_guidance["mid"])
+    Returns:
+        Guidance string
+    """
+    return SKILL_LEVEL_GUIDANCE.get(skill_level, SKILL_LEVEL_GUIDANCE["mid"])
 
 
 def get_analysis_prompt(
@@ -72,96 +141,92 @@ def get_analysis_prompt(
     language: str,
     skill_level: str,
     focus_areas: list,
-    existing_issues: list
+    existing_issues: Optional[list]
 ) -> str:
     """
     Get the analysis prompt for code review.
 
+    The static instructions and output schema come first; everything that
+    varies per request (context, issues, code) is appended after them.
+
     Args:
         code: Source code to analyze
         language: Programming language
         skill_level: Target skill level
         focus_areas: Areas to focus on
-        existing_issues: Issues already found by rule-based detectors
+        existing_issues: Issues already found by rule-based detectors, or None
 
     Returns:
         Analysis prompt string
     """
-    focus_areas_str = ", ".join(focus_areas)
+    context = _get_context_block(language, skill_level, tuple(sorted(focus_areas)))
 
-    prompt = f"""Analyze this {language} code thoroughly.
+    return f"""{context}
+**Issues Already Detected (by rule-based checkers):**
+{format_existing_issues(existing_issues)}
 
 **Code to Review:**
 ```{language}
 {code}
-```
+```"""
 
-**Context:**
-- Skill Level: {skill_level}
-- Focus Areas: {focus_areas_str}
 
-**Issues Already Detected (by rule-based checkers):**
-{format_existing_issues(existing_issues)}
+@lru_cache(maxsize=64)
+def _get_context_block(language: str, skill_level: str, focus_areas: tuple) -> str:
+    """
+    Build the instructions and review context shared by identical request settings.
 
-Your task:
-1. Identify additional issues not caught by rule-based detectors
-2. Provide deep analysis of the code's quality and architecture
-3. Generate an improved version of the code addressing all issues
-4. Create follow-up questions to challenge the developer's thinking
+    Args:
+        language: Programming language
+        skill_level: Target skill level
+        focus_areas: Sorted focus areas
 
-Respond in this exact JSON format:
-{{
-  "additional_issues": [
-    {{
-      "line": <line_number>,
-      "severity": "error|warning|info",
-      "category": "bug|performance|security|clean-code|anti-pattern",
-      "message": "Brief description of the issue",
-      "explanation": "Detailed explanation of why this is a problem",
-      "suggestion": "How a senior engineer would fix this"
-    }}
-  ],
-  "improved_code": "Complete refactored code with all improvements applied",
-  "follow_up_questions": [
-    "Question 1 that challenges thinking",
-    "Question 2 about edge cases",
-    "Question 3 about trade-offs"
-  ],
-  "code_quality": {{
-    "architecture": "Assessment of overall architecture",
-    "readability": "Assessment of code readability",
-    "maintainability": "Assessment of maintainability",
-    "performance": "Assessment of performance characteristics",
-    "security": "Assessment of security posture"
-  }}
-}}
+    Returns:
+        Prompt prefix ending just before the per-request content
+    """
+    focus_areas_str = ", ".join(focus_areas)
 
-Focus on producing actionable, senior-level feedback that helps the developer improve."""
+    return f"""{ANALYSIS_INSTRUCTIONS}
+
+---
 
-    return prompt
+**Context:**
+- Language: {language}
+- Skill Level: {skill_level}
+- Focus Areas: {focus_areas_str}
+
+**Review Guidance:**
+{get_skill_level_guidance(skill_level)}
+"""
 
 
-def format_existing_issues(issues: list) -> str:
+def format_existing_issues(issues: Optional[list]) -> str:
     """
     Format existing issues for the prompt.
 
     Args:
-        issues: List of existing issues
+        issues: List of existing issues, or None if detectors have not run yet
 
     Returns:
         Formatted string
     """
+    if issues is None:
+        return "Not available - rule-based checks run alongside this review. Report every issue you find."
+
     if not issues:
         return "No issues detected by rule-based checkers."
 
-    formatted = []
-    for issue in issues:
-        formatted.append(
-            f"- Line {issue.get('line', '?')}: [{issue.get('severity', 'info')}] "
-            f"{issue.get('message', 'Unknown issue')}"
-        )
+    # str.join materializes its argument anyway; a list comprehension is the
+    # cheapest way to hand it one
+    return "\n".join([_format_issue(issue) for issue in issues])
 
-    return "\n".join(formatted)
+
+def _format_issue(issue: dict) -> str:
+    """Format one issue as a line of format_existing_issues output."""
+    return (
+        f"- Line {issue.get('line', '?')}: [{issue.get('severity', 'info')}] "
+        f"{issue.get('message', 'Unknown issue')}"
+    )
 
 
 def get_improvement_prompt(
@@ -243,3 +308,197 @@ Generate 3-5 questions that:
 5. Push for deeper understanding of trade-offs
 
 Questions should be open-ended and provoke thoughtful answers, not yes/no questions."""
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of text.
+
+    Uses tiktoken's cl100k_base encoding when tiktoken is installed (close to,
+    but not exactly, the Groq models' tokenizers), otherwise about 4
+    characters per token.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    if _get_encoding() is None:
+        return len(text) // 4
+    return _count_tokens(text)
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tiktoken encoding once, or return None if unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:  # the encoding file is downloaded on first use
+        logger.info("tiktoken encoding unavailable, estimating tokens by length: %s", e)
+        return None
+
+
+def _count_tokens(text: str) -> int:
+    """Count tokens with tiktoken."""
+    return len(_get_encoding().encode(text, disallowed_special=()))
+
+
+def _chars_per_token(text: str) -> float:
+    """Average characters per token of text, for budgets measured in characters."""
+    if _get_encoding() is None:
+        return 4
+    return len(text) / max(1, _count_tokens(text))
+
+
+def fit_code_to_budget(
+    code: str,
+    language: str,
+    issues: list,
+    max_tokens: int = MAX_CODE_TOKENS
+) -> Tuple[str, list]:
+    """
+    Shrink code, and the detector issues listed with it, to the prompt budget.
+
+    The code is split into top-level definitions (Python) or blank-line
+    separated blocks (other languages). Blocks with the most detector issues
+    per line are kept, in source order, each tagged with its original line
+    range. Falls back to keeping the head and tail of the file. Only issues
+    on kept lines are returned, at most MAX_PROMPT_ISSUES of them, and room
+    for them is taken out of the code's budget.
+
+    Args:
+        code: Full source code
+        language: Programming language
+        issues: Issues found by rule-based detectors
+        max_tokens: Token budget for the code and its issues
+
+    Returns:
+        (code to embed in the prompt, issues to list with it)
+    """
+    lines = code.split("\n")
+    budget = int(max_tokens * _chars_per_token(code))
+
+    # Reserve room for the longest issue lines the prompt could list
+    issue_sizes = sorted((len(_format_issue(issue)) + 1 for issue in issues), reverse=True)
+    budget = max(0, budget - sum(issue_sizes[:MAX_PROMPT_ISSUES]))
+
+    if len(code) <= budget:
+        return code, issues[:MAX_PROMPT_ISSUES]
+
+    comment = "#" if language == "python" else "//"
+    chunks = _split_code_chunks(code, language, len(lines))
+    chunk_starts = [start for start, _ in chunks]
+    issue_counts = [0] * len(chunks)
+    for issue in issues:
+        line = issue.get("line")
+        if isinstance(line, int) and 1 <= line <= len(lines):
+            issue_counts[bisect.bisect_right(chunk_starts, line) - 1] += 1
+
+    ranked = sorted(
+        range(len(chunks)),
+        key=lambda index: issue_counts[index] / (chunks[index][1] - chunks[index][0] + 1),
+        reverse=True
+    )
+
+    selected = []
+    used = 0
+    for index in ranked:
+        start, end = chunks[index]
+        size = sum(len(line) + 1 for line in lines[start - 1:end])
+        if used + size <= budget:
+            selected.append(index)
+            used += size
+
+    if not selected:
+        prompt_code, kept = _head_tail(lines, budget, comment)
+        return prompt_code, _issues_in_ranges(issues, kept)
+
+    kind = "top-level definitions" if language == "python" else "blocks"
+    parts = [
+        f"{comment} [truncated: showing {len(selected)} of {len(chunks)} {kind} "
+        f"ranked by issue density]"
+    ]
+    kept = [chunks[index] for index in sorted(selected)]
+    for start, end in kept:
+        parts.append(f"{comment} [lines {start}-{end}]")
+        parts.extend(lines[start - 1:end])
+
+    return "\n".join(parts), _issues_in_ranges(issues, kept)
+
+
+def _issues_in_ranges(issues: list, ranges: List[Tuple[int, int]]) -> list:
+    """Issues whose line falls in one of the sorted (start, end) ranges, capped."""
+    starts = [start for start, _ in ranges]
+    kept = []
+    for issue in issues:
+        line = issue.get("line")
+        if not isinstance(line, int):
+            continue
+        index = bisect.bisect_right(starts, line) - 1
+        if index >= 0 and line <= ranges[index][1]:
+            kept.append(issue)
+            if len(kept) == MAX_PROMPT_ISSUES:
+                break
+    return kept
+
+
+def _split_code_chunks(code: str, language: str, line_count: int) -> List[Tuple[int, int]]:
+    """Split code into (start_line, end_line) ranges, 1-based and inclusive."""
+    starts = []
+    if language == "python":
+        try:
+            tree = ast.parse(code)
+        except (SyntaxError, ValueError):
+            tree = None
+        if tree is not None:
+            for node in tree.body:
+                decorators = getattr(node, "decorator_list", [])
+                starts.append(min([node.lineno] + [d.lineno for d in decorators]))
+
+    if not starts:
+        # Blank-line separated blocks
+        previous_blank = True
+        for number, line in enumerate(code.split("\n"), 1):
+            blank = not line.strip()
+            if not blank and previous_blank:
+                starts.append(number)
+            previous_blank = blank
+
+    if not starts:
+        return [(1, line_count)]
+
+    starts[0] = 1
+    ends = [start - 1 for start in starts[1:]] + [line_count]
+    return list(zip(starts, ends))
+
+
+def _head_tail(lines: List[str], budget: int, comment: str) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Keep the first and last lines of the file within budget characters.
+
+    Returns:
+        (trimmed code, kept (start, end) line ranges)
+    """
+    half = budget // 2
+    head, used = [], 0
+    for line in lines:
+        if used + len(line) + 1 > half:
+            break
+        head.append(line)
+        used += len(line) + 1
+
+    tail, used = [], 0
+    for line in reversed(lines[len(head):]):
+        if used + len(line) + 1 > half:
+            break
+        tail.append(line)
+        used += len(line) + 1
+    tail.reverse()
+
+    omitted = len(lines) - len(head) - len(tail)
+    marker = f"{comment} [truncated: {omitted} lines omitted, next line is line {len(head) + omitted + 1}]"
+    kept = [(1, len(head)), (len(lines) - len(tail) + 1, len(lines))]
+    return "\n".join(head + [marker] + tail), kept
@@ -3,8 +3,73 @@ Code scoring system for the AI Code Reviewer & Mentor.
 Calculates scores across multiple dimensions of code quality.
 """
 
+import re
 from typing import Dict, List, Any
 
+# Score dimensions, in the order they are reported
+_DIMENSIONS = ("correctness", "readability", "maintainability", "performance", "security")
+
+# Points deducted per issue, by severity
+_SEVERITY_WEIGHTS = {
+    "error": 15,
+    "warning": 8,
+    "info": 3
+}
+
+# Dimensions each issue category affects, with their multipliers
+_CATEGORY_IMPACTS = {
+    "bug": {"correctness": 1.5, "security": 0.5},
+    "security": {"security": 2.0, "correctness": 0.5},
+    "performance": {"performance": 1.5},
+    "clean-code": {"readability": 1.0, "maintainability": 1.0},
+    "anti-pattern": {"maintainability": 1.5, "readability": 0.5}
+}
+
+# The same table keyed for the scoring loop: category -> ((dimension index, impact), ...)
+_CATEGORY_TABLE = {
+    category: tuple((_DIMENSIONS.index(dimension), impact) for dimension, impact in impacts.items())
+    for category, impacts in _CATEGORY_IMPACTS.items()
+}
+
+# Unknown categories apply to correctness
+_DEFAULT_IMPACT = ((0, 1),)
+
+# Positive indicators
+_POSITIVE_KEYWORDS = {
+    "excellent": 10,
+    "outstanding": 10,
+    "great": 8,
+    "good": 5,
+    "solid": 5,
+    "clean": 5,
+    "well-structured": 5,
+    "efficient": 5,
+    "scalable": 5
+}
+
+# Negative indicators
+_NEGATIVE_KEYWORDS = {
+    "poor": -15,
+    "bad": -15,
+    "problematic": -12,
+    "concerning": -10,
+    "difficult": -10,
+    "inefficient": -10,
+    "slow": -8,
+    "messy": -8,
+    "confusing": -8,
+    "risky": -12,
+    "fragile": -10,
+    "brittle": -10
+}
+
+# Finds every keyword in one pass. The lookahead matches at each position
+# without consuming text, so overlapping hits ("efficient" inside
+# "inefficient") are still found, as with a substring test per keyword.
+_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, {**_POSITIVE_KEYWORDS, **_NEGATIVE_KEYWORDS})) + "))"
+)
+
 
 def score_code(
     issues: List[Dict[str, Any]],
@@ -20,46 +85,34 @@ def score_code(
     Returns:
         Dictionary with scores for each dimension
     """
-    # Base score starts at 100
+    # Base score starts at 100, held by dimension index while deducting
     base_score = 100
+    values = [base_score] * len(_DIMENSIONS)
+
+    severity_weight = _SEVERITY_WEIGHTS.get
+    category_table = _CATEGORY_TABLE.get
 
-    # Categorize issues by severity and category
-    severity_weights = {
-        "error": 15,
-        "warning": 8,
-        "info": 3
-    }
-
-    category_impacts = {
-        "bug": {"correctness": 1.5, "security": 0.5},
-        "security": {"security": 2.0, "correctness": 0.5},
-        "performance": {"performance": 1.5},
-        "clean-code": {"readability": 1.0, "maintainability": 1.0},
-        "anti-pattern": {"maintainability": 1.5, "readability": 0.5}
-    }
-
-    # Initialize scores
-    scores = {
-        "correctness": base_score,
-        "readability": base_score,
-        "maintainability": base_score,
-        "performance": base_score,
-        "security": base_score
-    }
+    # Bit i is set once dimension i reaches 0; further issues cannot change
+    # a floored dimension, so scoring stops when every dimension is floored
+    floored = 0
+    all_floored = (1 << len(_DIMENSIONS)) - 1
 
     # Apply deductions for issues
     for issue in issues:
-        severity = issue.get("severity", "info")
-        category = issue.get("category", "bug")
+        deduction = severity_weight(issue.get("severity", "info"), 5)
+
+        for index, impact in category_table(issue.get("category", "bug"), _DEFAULT_IMPACT):
+            value = values[index] - (deduction * impact)
+            if value > 0:
+                values[index] = value
+            else:
+                values[index] = 0
+                floored |= 1 << index
 
-        deduction = severity_weights.get(severity, 5)
+        if floored == all_floored:
+            break
 
-        if category in category_impacts:
-            for dimension, impact in category_impacts[category].items():
-                scores[dimension] = max(0, scores[dimension] - (deduction * impact))
-        else:
-            # Apply to correctness by default
-            scores["correctness"] = max(0, scores["correctness"] - deduction)
+    scores = dict(zip(_DIMENSIONS, values))
 
     # Apply LLM assessment adjustments
     scores = _apply_llm_assessments(scores, code_quality_assessment)
@@ -89,45 +142,19 @@ def _apply_llm_assessments(
         Adjusted scores
     """
     assessment_text = " ".join(assessment.values()).lower()
+    found = set(_KEYWORD_RE.findall(assessment_text))
+    if not found:
+        return scores
 
-    # Positive indicators
-    positive_keywords = {
-        "excellent": 10,
-        "outstanding": 10,
-        "great": 8,
-        "good": 5,
-        "solid": 5,
-        "clean": 5,
-        "well-structured": 5,
-        "efficient": 5,
-        "scalable": 5
-    }
-
-    # Negative indicators
-    negative_keywords = {
-        "poor": -15,
-        "bad": -15,
-        "problematic": -12,
-        "concerning": -10,
-        "difficult": -10,
-        "inefficient": -10,
-        "slow": -8,
-        "messy": -8,
-        "confusing": -8,
-        "risky": -12,
-        "fragile": -10,
-        "brittle": -10
-    }
-
-    # Apply adjustments based on assessment text
-    for keyword, adjustment in positive_keywords.items():
-        if keyword in assessment_text:
+    # Apply adjustments based on assessment text; each keyword counts once
+    for keyword, adjustment in _POSITIVE_KEYWORDS.items():
+        if keyword in found:
             # Distribute adjustment across dimensions
             for key in scores:
                 scores[key] = min(100, scores[key] + adjustment / 5)
 
-    for keyword, adjustment in negative_keywords.items():
-        if keyword in assessment_text:
+    for keyword, adjustment in _NEGATIVE_KEYWORDS.items():
+        if keyword in found:
             # Distribute adjustment across dimensions
             for key in scores:
                 scores[key] = max(0, scores[key] + adjustment / 5)
@@ -1,25 +1,104 @@
 """
-Flask server for the AI Code Reviewer & Agent.
+Quart server for the AI Code Reviewer & Agent.
 Exposes HTTP endpoints for the Node.js backend to call.
+
+Handlers are async, so a single process keeps serving other requests while
+a review waits on the Groq API.
 """
 
 import os
+import json
+import queue
+import atexit
+import asyncio
+import hashlib
 import logging
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-from groq import Groq
-from .agent import create_agent
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+import httpx
+from quart import Quart, Response, abort, request, jsonify
+from quart.json.provider import DefaultJSONProvider
+from quart_cors import cors
+from groq import AsyncGroq, AuthenticationError
+from .agent import AnalysisRequest, create_agent
+from .cache import LRUCache, TTLCache, make_cache_key
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each log record as a single-line JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if orjson is not None:
+            return orjson.dumps(entry).decode()
+        return json.dumps(entry)
+
+
+def _configure_logging() -> None:
+    """
+    Send log records through a queue to a JSON handler on a background thread.
+
+    Request handlers only enqueue records; formatting and the blocking write
+    to stderr happen on the listener thread, off the event loop.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+_configure_logging()
 logger = logging.getLogger(__name__)
 
-# Initialize Flask app
-app = Flask(__name__)
-CORS(app)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson for request bodies and responses."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+# Initialize Quart app
+app = Quart(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Only the configured frontends may call the API from a browser; the Node.js
+# backend calls it server-to-server and is not subject to CORS
+CORS_ORIGINS = [
+    origin.strip() for origin in os.getenv('CORS_ORIGIN', 'http://localhost:5173').split(',')
+]
+app = cors(
+    app,
+    allow_origin=CORS_ORIGINS,
+    allow_methods=['GET', 'POST'],
+    expose_headers=['X-Cache'],
+    max_age=600
+)
 
 # Get API key from environment
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
@@ -29,9 +108,149 @@ if not GROQ_API_KEY:
 # Create agent instance
 agent = create_agent(GROQ_API_KEY) if GROQ_API_KEY else None
 
+# Accepted request values
+SUPPORTED_LANGUAGES = frozenset({'javascript', 'typescript', 'python', 'go', 'java', 'cpp', 'c'})
+SKILL_LEVELS = frozenset({'junior', 'mid', 'senior'})
+VALID_FOCUS_AREAS = frozenset({'bugs', 'performance', 'security', 'clean-code', 'all'})
+
+# Reject oversized bodies with 413 before they are parsed. Quart enforces
+# MAX_CONTENT_LENGTH while the body is received, so it holds the largest limit
+# any route accepts and _get_json_body applies the per-route one. A single
+# request has room for a 50,000-character submission even if every character
+# arrives as a 6-byte \uXXXX escape.
+MAX_REQUEST_CONTENT_LENGTH = 320 * 1024
+MAX_BATCH_CONTENT_LENGTH = 2 * 1024 * 1024
+app.config['MAX_CONTENT_LENGTH'] = MAX_BATCH_CONTENT_LENGTH
+
+# Maximum submissions accepted by one batch request
+MAX_BATCH_ITEMS = 20
+
+# Complete reviews for resubmitted code (CI retries, editor auto-save).
+# Large submissions are not kept, which bounds the cache's memory.
+_response_cache = TTLCache(maxsize=1024, ttl=3600)
+MAX_CACHED_CODE_SIZE = 10 * 1024
+
+# API key checks by sha256 of the key, so the UI can re-validate freely
+_validation_cache = TTLCache(maxsize=256, ttl=300)
+VALIDATION_TIMEOUT = 3.0
+
+# Groq clients for key validation, by key hash. They all share one pooled
+# HTTP client, opened with the server, so repeat checks skip the TLS handshake.
+_validation_clients = LRUCache(maxsize=64)
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _parse_analysis_request(data: Dict[str, Any]) -> Tuple[Optional[AnalysisRequest], Optional[str]]:
+    """
+    Validate an analysis request body.
+
+    Args:
+        data: Decoded JSON object with code, language, skillLevel, focusAreas
+
+    Returns:
+        (request, None) when valid, otherwise (None, error message)
+    """
+    code = data.get('code')
+    language = data.get('language')
+    skill_level = data.get('skillLevel', 'mid')
+    focus_areas = data.get('focusAreas', ['bugs', 'performance', 'security', 'clean-code'])
+
+    # Validate code
+    if not code:
+        return None, "Code is required"
+
+    if not isinstance(code, str):
+        return None, "Code must be a string"
+
+    if len(code) > 50000:  # Limit code size
+        return None, "Code too large (max 50000 characters)"
+
+    # Validate language
+    if language and language.lower() not in SUPPORTED_LANGUAGES:
+        return None, f"Unsupported language. Supported: {', '.join(sorted(SUPPORTED_LANGUAGES))}"
+
+    # Normalize language
+    language = language.lower() if language else 'javascript'
+
+    # Validate skill level
+    if skill_level not in SKILL_LEVELS:
+        return None, "Invalid skill level. Must be: junior, mid, or senior"
+
+    # Validate focus areas
+    if not isinstance(focus_areas, list) or not all(isinstance(area, str) for area in focus_areas):
+        return None, "focusAreas must be an array of strings"
+
+    invalid_areas = set(focus_areas) - VALID_FOCUS_AREAS
+    if invalid_areas:
+        return None, (
+            f"Invalid focus area: {', '.join(sorted(invalid_areas))}. "
+            f"Must be one of: {', '.join(sorted(VALID_FOCUS_AREAS))}"
+        )
+
+    return AnalysisRequest(code, language, skill_level, focus_areas), None
+
+
+async def _get_json_body(max_length: int = MAX_REQUEST_CONTENT_LENGTH) -> Any:
+    """
+    Read and decode the JSON request body, aborting with 413 over max_length.
+
+    Args:
+        max_length: Largest body accepted by the route, in bytes
+
+    Returns:
+        Decoded JSON body, or None if it is not JSON
+    """
+    if request.content_length is not None and request.content_length > max_length:
+        abort(413)
+    # Chunked bodies declare no length, so check what was received
+    if len(await request.get_data()) > max_length:
+        abort(413)
+    return await request.get_json()
+
+
+@app.before_serving
+async def open_http_client():
+    """Create the connection pool shared by validation clients."""
+    global _http_client
+    _http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    )
+
+
+@app.after_serving
+async def close_agent():
+    """Release the agent's and the server's HTTP connection pools on shutdown."""
+    if agent:
+        await agent.aclose()
+    if _http_client is not None:
+        await _http_client.aclose()
+
+
+def _get_validation_client(api_key: str, key_hash: str) -> AsyncGroq:
+    """
+    Get the Groq client used to validate an API key.
+
+    Args:
+        api_key: Groq API key
+        key_hash: sha256 hex digest of api_key
+
+    Returns:
+        Client bound to the shared connection pool
+    """
+    client = _validation_clients.get(key_hash)
+    if client is None:
+        client = AsyncGroq(
+            api_key=api_key,
+            http_client=_http_client,
+            timeout=VALIDATION_TIMEOUT,
+            max_retries=0
+        )
+        _validation_clients.put(key_hash, client)
+    return client
+
 
 @app.route('/health', methods=['GET'])
-def health_check():
+async def health_check():
     """Health check endpoint."""
     return jsonify({
         "status": "healthy",
@@ -40,7 +259,7 @@ def health_check():
 
 
 @app.route('/api/analyze', methods=['POST'])
-def analyze_code():
+async def analyze_code():
     """
     Analyze code and return comprehensive review.
 
@@ -66,61 +285,210 @@ def analyze_code():
             "error": "AI agent not initialized. Please set GROQ_API_KEY."
         }), 500
 
-    try:
-        data = request.get_json()
+    # Outside the try so oversized or malformed bodies keep their 413/400
+    data = await _get_json_body()
 
+    try:
         # Validate required fields
         if not data:
             return jsonify({"error": "Request body is required"}), 400
 
-        code = data.get('code')
-        language = data.get('language')
-        skill_level = data.get('skillLevel', 'mid')
-        focus_areas = data.get('focusAreas', ['bugs', 'performance', 'security', 'clean-code'])
+        analysis_request, error = _parse_analysis_request(data)
+        if error:
+            return jsonify({"error": error}), 400
+
+        cache_key = None
+        if len(analysis_request.code) <= MAX_CACHED_CODE_SIZE:
+            cache_key = make_cache_key(
+                analysis_request.code,
+                analysis_request.language,
+                analysis_request.skill_level,
+                analysis_request.focus_areas
+            )
+            result = _response_cache.get(cache_key)
+            if result is not None:
+                return jsonify(result), 200, {"X-Cache": "HIT"}
+
+        logger.info(
+            "Analyzing %s code for %s developer",
+            analysis_request.language, analysis_request.skill_level
+        )
 
-        # Validate code
-        if not code:
-            return jsonify({"error": "Code is required"}), 400
+        # Perform analysis
+        result = await agent.analyze_async(
+            analysis_request.code,
+            analysis_request.language,
+            analysis_request.skill_level,
+            analysis_request.focus_areas
+        )
 
-        if not isinstance(code, str):
-            return jsonify({"error": "Code must be a string"}), 400
+        # A partial review (Groq failed) would hide the recovery for an hour
+        if cache_key is not None and not result.get("partial"):
+            _response_cache.put(cache_key, result)
 
-        if len(code) > 50000:  # Limit code size
-            return jsonify({"error": "Code too large (max 50000 characters)"}), 400
+        return jsonify(result), 200, {"X-Cache": "MISS"}
+
+    except Exception as e:
+        logger.error("Error during analysis: %s", e)
+        return jsonify({
+            "error": "Internal server error during code analysis",
+            "details": str(e)
+        }), 500
+
+
+@app.route('/api/analyze/stream', methods=['POST'])
+async def analyze_code_stream():
+    """
+    Analyze code, sending each stage of the review as a server-sent event.
+
+    Request body: same as /api/analyze
+
+    Response (text/event-stream), one event per stage:
+        event: detectors   data: {"issues": [...]}
+        event: llm_delta   data: {"text": string}   (raw Groq output, repeated)
+        event: scores      data: {"score": {...}, "issues": [...]}
+        event: mentor      data: {"mentorExplanation": string}
+        event: done        data: {"result": <same object as /api/analyze>}
+        event: error       data: {"error": string}  (replaces the rest on failure)
+    """
+    if not agent:
+        return jsonify({
+            "error": "AI agent not initialized. Please set GROQ_API_KEY."
+        }), 500
+
+    data = await _get_json_body()
+
+    # Validate required fields
+    if not data:
+        return jsonify({"error": "Request body is required"}), 400
+
+    analysis_request, error = _parse_analysis_request(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    logger.info(
+        "Streaming %s analysis for %s developer",
+        analysis_request.language, analysis_request.skill_level
+    )
+
+    response = Response(
+        _stream_events(analysis_request),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+    # A long completion must not be cut off by the default response timeout
+    response.timeout = None
+    return response
+
+
+async def _stream_events(analysis_request: AnalysisRequest) -> AsyncIterator[str]:
+    """
+    Format agent.analyze_stream events as server-sent events.
+
+    The Groq stream is blocking, so each event is pulled on a worker thread.
+    If the client disconnects, the agent's generator is closed so the Groq
+    stream stops being read.
+
+    Args:
+        analysis_request: Validated request
+
+    Yields:
+        SSE-encoded events
+    """
+    events = agent.analyze_stream(
+        analysis_request.code,
+        analysis_request.language,
+        analysis_request.skill_level,
+        analysis_request.focus_areas
+    )
+    # A generator cannot be closed while a worker thread is running it
+    running = threading.Lock()
+
+    def pull() -> Optional[Dict[str, Any]]:
+        with running:
+            return next(events, None)
+
+    def close() -> None:
+        with running:
+            events.close()
+
+    try:
+        while True:
+            event = await asyncio.to_thread(pull)
+            if event is None:
+                break
+            phase = event.pop("phase")
+            yield f"event: {phase}\ndata: {app.json.dumps(event)}\n\n"
+
+    except Exception as e:
+        logger.error("Error during streamed analysis: %s", e)
+        error = app.json.dumps({"error": "Internal server error during code analysis"})
+        yield f"event: error\ndata: {error}\n\n"
+
+    finally:
+        # Runs after any pull still in flight; not awaited, so a disconnect
+        # does not wait for the next Groq chunk
+        asyncio.get_running_loop().run_in_executor(None, close)
 
-        # Validate language
-        supported_languages = ['javascript', 'typescript', 'python', 'go', 'java', 'cpp', 'c']
-        if language and language.lower() not in supported_languages:
-            return jsonify({
-                "error": f"Unsupported language. Supported: {', '.join(supported_languages)}"
-            }), 400
 
-        # Normalize language
-        language = language.lower() if language else 'javascript'
+@app.route('/api/analyze/batch', methods=['POST'])
+async def analyze_batch():
+    """
+    Analyze several submissions concurrently.
+
+    Groq calls are bounded and throttled inside the agent (LLM_CONCURRENCY,
+    LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE) and retried with backoff
+    on rate-limit responses.
+
+    Request body:
+    {
+        "items": [ <same object as /api/analyze>, ... ]
+    }
+
+    Response:
+    {
+        "results": [ <same object as /api/analyze>, ... ]  (in request order)
+    }
+    """
+    if not agent:
+        return jsonify({
+            "error": "AI agent not initialized. Please set GROQ_API_KEY."
+        }), 500
+
+    # A batch carries up to MAX_BATCH_ITEMS submissions
+    data = await _get_json_body(MAX_BATCH_CONTENT_LENGTH)
 
-        # Validate skill level
-        if skill_level not in ['junior', 'mid', 'senior']:
+    try:
+        # Validate required fields
+        if not data:
+            return jsonify({"error": "Request body is required"}), 400
+
+        items = data.get('items')
+        if not items or not isinstance(items, list):
+            return jsonify({"error": "items must be a non-empty array"}), 400
+
+        if len(items) > MAX_BATCH_ITEMS:
             return jsonify({
-                "error": "Invalid skill level. Must be: junior, mid, or senior"
+                "error": f"Too many items (max {MAX_BATCH_ITEMS})"
             }), 400
 
-        # Validate focus areas
-        valid_areas = ['bugs', 'performance', 'security', 'clean-code', 'all']
-        for area in focus_areas:
-            if area not in valid_areas:
-                return jsonify({
-                    "error": f"Invalid focus area: {area}. Must be one of: {', '.join(valid_areas)}"
-                }), 400
+        batch = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                return jsonify({"error": f"Item {index}: must be an object"}), 400
+            analysis_request, error = _parse_analysis_request(item)
+            if error:
+                return jsonify({"error": f"Item {index}: {error}"}), 400
+            batch.append(analysis_request)
 
-        logger.info(f"Analyzing {language} code for {skill_level} developer")
+        logger.info("Analyzing batch of %d submissions", len(batch))
 
-        # Perform analysis
-        result = agent.analyze(code, language, skill_level, focus_areas)
+        results = await agent.analyze_batch(batch)
 
-        return jsonify(result), 200
+        return jsonify({"results": results}), 200
 
     except Exception as e:
-        logger.error(f"Error during analysis: {str(e)}")
+        logger.error("Error during batch analysis: %s", e)
         return jsonify({
             "error": "Internal server error during code analysis",
             "details": str(e)
@@ -128,7 +496,7 @@ def analyze_code():
 
 
 @app.route('/api/validate', methods=['POST'])
-def validate_setup():
+async def validate_setup():
     """
     Validate that the AI agent is properly configured.
 
@@ -143,50 +511,69 @@ def validate_setup():
         "message": string
     }
     """
+    data = await _get_json_body()
+
     try:
-        data = request.get_json()
         api_key = data.get('apiKey')
 
         if not api_key:
             return jsonify({"valid": False, "message": "API key is required"}), 400
 
-        # Test the API key by making a simple request
-        test_client = Groq(api_key=api_key)
-        response = test_client.chat.completions.create(
-            model="mixtral-8x7b-32768",
-            messages=[{"role": "user", "content": "test"}],
-            max_tokens=5
-        )
+        key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+        cached = _validation_cache.get(key_hash)
+        if cached is not None:
+            body, status = cached
+            return jsonify(body), status
 
-        return jsonify({
-            "valid": True,
-            "message": "API key is valid"
-        }), 200
+        # Test the API key with an authenticated request that uses no tokens
+        try:
+            await _get_validation_client(api_key, key_hash).models.list()
+            body, status = {"valid": True, "message": "API key is valid"}, 200
+        except AuthenticationError as e:
+            logger.error("API key validation failed: %s", e)
+            body, status = {"valid": False, "message": f"Invalid API key: {str(e)}"}, 400
+
+        # Only definite answers are cached; timeouts and outages fall through
+        _validation_cache.put(key_hash, (body, status))
+        return jsonify(body), status
 
     except Exception as e:
-        logger.error(f"API key validation failed: {str(e)}")
+        logger.error("API key validation failed: %s", e)
         return jsonify({
             "valid": False,
             "message": f"Invalid API key: {str(e)}"
         }), 400
 
 
+@app.errorhandler(400)
+async def bad_request(error):
+    """Handle request bodies that are not valid JSON."""
+    return jsonify({"error": "Request body must be valid JSON"}), 400
+
+
 @app.errorhandler(404)
-def not_found(error):
+async def not_found(error):
     """Handle 404 errors."""
     return jsonify({"error": "Endpoint not found"}), 404
 
 
+@app.errorhandler(413)
+async def payload_too_large(error):
+    """Handle request bodies over MAX_CONTENT_LENGTH."""
+    return jsonify({"error": "Request body too large"}), 413
+
+
 @app.errorhandler(500)
-def internal_error(error):
+async def internal_error(error):
     """Handle 500 errors."""
-    logger.error(f"Internal server error: {str(error)}")
+    logger.error("Internal server error: %s", error)
     return jsonify({"error": "Internal server error"}), 500
 
 
+# Development server only; production runs under gunicorn (gunicorn.conf.py)
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 8000))
     debug = os.getenv('DEBUG', 'False').lower() == 'true'
 
-    logger.info(f"Starting AI Agent server on port {port}")
+    logger.info("Starting AI Agent server on port %s", port)
     app.run(host='0.0.0.0', port=port, debug=debug)
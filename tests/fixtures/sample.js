@@ -0,0 +1,25 @@
+const api_key = "abcdefghijklmnopqrstuvwxyz";
+let password = 'hunter22';
+async function load(a) {
+  const r = await fetch(a.b.c);
+  if (a == 3) { return 1234; }
+  for (let i = 0; i < arr.length; i++) {
+    db.query("SELECT * FROM t WHERE id=" + i);
+    x = arr.length();
+  }
+  while (true) {
+    el.innerHTML = data;
+  }
+  eval("2+2");
+  const h = md5(data); // md5 describes design
+  el.addEventListener('click', () => {});
+  y = y + 0;
+  // if (user.isAdmin)
+  // a
+  // b
+  // c
+  // d
+  return 5;
+  console.log("dead");
+}
+config(password = "abcd", api_key = "aaaaaaaaaaaaaaaaaaaaaaaa", private_key = "bbbbbbbbbbbbbbbbbbbbbbbbbb");
@@ -0,0 +1,51 @@
+"""Regression tests pinning the fused detector pass to recorded output."""
+
+import importlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+detectors = importlib.import_module("ai-agent.detectors")
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+EXPECTED = json.loads((FIXTURES / "expected_issues.json").read_text())
+SAMPLES = {"sample.py": "python", "sample.js": "javascript"}
+
+
+def _detect(name, categories=detectors.DETECTOR_CATEGORIES):
+    ctx = detectors.CodeContext.from_code((FIXTURES / name).read_text(), SAMPLES[name])
+    return detectors.run_all_detectors(ctx, categories)
+
+
+@pytest.mark.parametrize("name", sorted(SAMPLES))
+@pytest.mark.parametrize("category", detectors.DETECTOR_CATEGORIES)
+def test_category_matches_fixture(name, category):
+    assert EXPECTED[name][category], "fixture should exercise every category"
+    assert _detect(name, [category])[category] == EXPECTED[name][category]
+
+
+@pytest.mark.parametrize("name", sorted(SAMPLES))
+def test_all_categories_in_one_pass_match_fixture(name):
+    assert _detect(name) == EXPECTED[name]
+
+
+def test_secrets_on_one_line_are_reported_in_pattern_order():
+    issues = _detect("sample.js", ["security"])["security"]
+    last_line = max(issue["line"] for issue in issues)
+    messages = [issue["message"] for issue in issues if issue["line"] == last_line]
+
+    assert messages == [
+        "Hardcoded API key detected",
+        "Hardcoded password detected",
+        "Hardcoded private key detected"
+    ]
+
+
+def test_results_are_fresh_copies():
+    first = _detect("sample.py", ["bug"])
+    first["bug"][0]["message"] = "changed"
+
+    assert _detect("sample.py", ["bug"]) == {"bug": EXPECTED["sample.py"]["bug"]}
@@ -0,0 +1,36 @@
+"""Regression tests pinning score_code to recorded scores."""
+
+import importlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+detectors = importlib.import_module("ai-agent.detectors")
+scoring = importlib.import_module("ai-agent.scoring")
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+ISSUES = json.loads((FIXTURES / "expected_issues.json").read_text())
+SCORES = json.loads((FIXTURES / "expected_scores.json").read_text())
+
+
+@pytest.mark.parametrize("name", sorted(SCORES))
+def test_scores_match_fixture(name):
+    issues = [issue for category in detectors.DETECTOR_CATEGORIES for issue in ISSUES[name][category]]
+    for case in SCORES[name]:
+        assert scoring.score_code(issues, dict(case["assessment"])) == case["score"]
+
+
+def test_no_issues_scores_full_marks():
+    scores = scoring.score_code([], {})
+
+    assert scores == {
+        "correctness": 100,
+        "readability": 100,
+        "maintainability": 100,
+        "performance": 100,
+        "security": 100,
+        "overall": 100
+    }
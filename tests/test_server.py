@@ -0,0 +1,91 @@
+"""Tests for the Quart server's request limits and response cache."""
+
+import asyncio
+import importlib
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+server = importlib.import_module("ai-agent.server")
+
+# 48 KB of Python, under the 50,000-character limit for one submission
+SUBMISSION = {"code": "x = 1\n" * 8000, "language": "python", "skillLevel": "mid"}
+
+
+class FakeAgent:
+    """Stands in for CodeReviewAgent so no Groq requests are made."""
+
+    def __init__(self, partial=False):
+        self.partial = partial
+
+    async def analyze_async(self, code, language, skill_level, focus_areas):
+        result = {"improvedCode": "" if self.partial else code}
+        if self.partial:
+            result["partial"] = True
+        return result
+
+    async def analyze_batch(self, requests):
+        return [{"code_length": len(request.code)} for request in requests]
+
+
+def _post(path, body):
+    """POST a JSON body, returning (status, X-Cache header, decoded body)."""
+    async def send():
+        response = await server.app.test_client().post(path, json=body)
+        return response.status_code, response.headers.get("X-Cache"), await response.get_json()
+    return asyncio.run(send())
+
+
+def test_batch_over_single_request_limit_is_accepted(monkeypatch):
+    monkeypatch.setattr(server, "agent", FakeAgent())
+    body = {"items": [SUBMISSION] * 8}
+
+    status, _, data = _post("/api/analyze/batch", body)
+
+    assert status == 200
+    assert len(data["results"]) == 8
+
+
+def test_batch_over_batch_limit_is_rejected(monkeypatch):
+    monkeypatch.setattr(server, "agent", FakeAgent())
+    body = {"items": [{**SUBMISSION, "code": "x" * (server.MAX_BATCH_CONTENT_LENGTH + 1)}]}
+
+    status, _, _ = _post("/api/analyze/batch", body)
+
+    assert status == 413
+
+
+def test_single_request_over_limit_is_rejected(monkeypatch):
+    monkeypatch.setattr(server, "agent", FakeAgent())
+    body = {**SUBMISSION, "code": "x" * (server.MAX_REQUEST_CONTENT_LENGTH + 1)}
+
+    status, _, _ = _post("/api/analyze", body)
+
+    assert status == 413
+
+
+def test_malformed_json_is_rejected_with_json_error(monkeypatch):
+    monkeypatch.setattr(server, "agent", FakeAgent())
+
+    async def send():
+        response = await server.app.test_client().post(
+            "/api/analyze", data=b'{"code": ', headers={"Content-Type": "application/json"}
+        )
+        return response.status_code, await response.get_json()
+    status, data = asyncio.run(send())
+
+    assert status == 400
+    assert data == {"error": "Request body must be valid JSON"}
+
+
+def test_partial_review_is_not_cached(monkeypatch):
+    body = {**SUBMISSION, "code": "y = 2\n"}
+    monkeypatch.setattr(server, "agent", FakeAgent(partial=True))
+    assert _post("/api/analyze", body)[1] == "MISS"
+
+    # Once Groq recovers the full review is served, not the cached partial one
+    monkeypatch.setattr(server, "agent", FakeAgent())
+    _, cache_status, data = _post("/api/analyze", body)
+
+    assert cache_status == "MISS"
+    assert data["improvedCode"] == "y = 2\n"